@@ -7,28 +7,72 @@ Interpretation:
 - G_new = new Investors added EACH month
 - Monthly retention r_s, r_g keep a fraction of actives month-to-month.
 - Actives accumulate: Active_S(t) = S_new * (1 - r_s^t) / (1 - r_s)
+- Further segments (accelerators, funds, corporates, …) add their own price, new/month and retention;
+  all segments are evaluated together as (segments × months) arrays.
 
 Everything is MONTHLY (EUR/month for prices and costs).
 Required = Base + Marketing + (DiscountRate × CompanyValue)/12  (EUR/month).
+Prices, S_new/G_new and costs can follow per-month schedules (steps, growth, seasonality, uploaded series).
 
 Run any of:
     py pynn.py
     python pynn.py
     streamlit run pynn.py
 
+Import-time report (core imports numpy only; pandas/plotly load on first use):
+    python pynn.py --startup-profile
+
+Per-stage timing panel (?timing=1 in the URL, or PYNN_TIMING=1 for all sessions;
+PYNN_TIMING_LOG=timings.jsonl appends one JSON line per rerun):
+    PYNN_TIMING=1 PYNN_TIMING_LOG=timings.jsonl python pynn.py
+
+Monte Carlo runs on a process pool shared by all sessions; PYNN_WORKERS sets its size
+(default: CPUs - 1). Millisecond solvers (sensitivity, goal seek) run in-process.
+
+Headless batch (no Streamlit; scenario rows = Model field columns, CSV/Parquet or "-" for stdin):
+    python pynn.py batch scenarios.csv -o results.parquet --months 120 --workers 8
+
 Requires:
     pip install streamlit plotly numpy pandas
+    pip install pyarrow            # only for Parquet input/output
 """
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Optional
+from collections import OrderedDict, deque, namedtuple
+from contextlib import contextmanager
+from dataclasses import astuple, fields
+from typing import Callable, Hashable, Iterator, Optional, Sequence
+import argparse
+import datetime
+import functools
+import importlib
+import json
 import os, sys, subprocess
 import math
+import sqlite3
+import threading
+import time
 
 import numpy as np
-import pandas as pd
-import plotly.graph_objects as go
+
+from pynn_model import (MC_BATCH, SCHEDULE_FIELDS, Model, Schedule, Segment, _mc_batch, _mc_batch_star,
+                        mc_batches, mc_combine, model_segments, required_by_month, scheduled,
+                        segment_schedules, segment_vectors)
+
+
+class _LazyModule:
+    """Module proxy that imports on first attribute access, so `import pynn` only pays for numpy."""
+
+    def __init__(self, name: str):
+        self._name, self._mod = name, None
+
+    def __getattr__(self, attr: str):
+        if self._mod is None:
+            self._mod = importlib.import_module(self._name)
+        return getattr(self._mod, attr)
+
+pd = _LazyModule("pandas")                   # DataFrames: timelines, tables, batch I/O
+go = _LazyModule("plotly.graph_objects")     # charts only
 
 
 # ---------- Self-bootstrap Streamlit (no recursive respawn) ----------
@@ -43,35 +87,171 @@ def _launched_by_streamlit() -> bool:
     )
 
 def _bootstrap_streamlit():
+    """Start the Streamlit server in this interpreter, so numpy & co. are not imported twice."""
     script_path = os.path.abspath(__file__)
-    env = os.environ.copy()
-    env[BOOT_FLAG] = "1"
+    os.environ[BOOT_FLAG] = "1"
     try:
-        subprocess.run([sys.executable, "-m", "streamlit", "run", script_path], check=False, env=env)
-    except FileNotFoundError:
+        from streamlit.web import cli as stcli
+    except ImportError:
         print("Streamlit not found. Install with:  pip install streamlit", file=sys.stderr)
+        return
+    sys.argv = ["streamlit", "run", script_path]
+    stcli.main(prog_name="streamlit")
 
+_PROFILE_STAGES = (
+    ("core (import pynn)", "import pynn"),
+    ("pandas (first DataFrame)", "pynn.project_timeline(pynn.Model(), 12)"),
+    ("plotly (first chart)", "pynn.chart_overview_month(1.0, 1.0)"),
+    ("streamlit", "import streamlit"),
+)
 
-# --------------------------------- Model --------------------------------- #
-@dataclass
-class Model:
-    # Pricing (EUR per month)
-    price_startup_eur: float = 19.0
-    price_investor_eur: float = 79.0
+def startup_profile(top: int = 20) -> int:
+    """Print import time per startup stage and the slowest modules (via `python -X importtime`)."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = [f"import sys; sys.path.insert(0, {here!r})"]
+    for name, stmt in _PROFILE_STAGES:
+        code.append(f"sys.stderr.write('@@stage {name}\\n')")
+        code.append(f"try:\n    {stmt}\nexcept ImportError as e:\n    sys.stderr.write('@@skip %s\\n' % e)")
+    res = subprocess.run([sys.executable, "-X", "importtime", "-c", "\n".join(code)],
+                         capture_output=True, text=True)
+
+    stage, totals, mods = None, {}, []
+    for line in res.stderr.splitlines():
+        if line.startswith("@@stage "):
+            stage = line[8:]
+            totals[stage] = 0
+        elif line.startswith("@@skip "):
+            totals[stage] = None
+        elif line.startswith("import time:") and stage is not None and "|" in line:
+            self_us, cum_us, name = line[12:].split("|", 2)
+            if not self_us.strip().isdigit():
+                continue  # header line
+            depth = (len(name) - len(name.lstrip()) - 1) // 2  # one separator space, then 2 per level
+            if depth == 0 and totals[stage] is not None:
+                totals[stage] += int(cum_us)
+            mods.append((int(self_us), int(cum_us), name.strip(), stage))
+    print("Startup import time by stage:")
+    for name, us in totals.items():
+        print(f"  {name:<28} {'not installed' if us is None else f'{us / 1000:8.1f} ms'}")
+    print(f"\nSlowest {top} modules (self time):")
+    for self_us, cum_us, name, stg in sorted(mods, reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.1f} ms self  {cum_us / 1000:8.1f} ms cum  {name}  [{stg}]")
+    return res.returncode
+
+
+# ---------------------------------- Timing --------------------------------- #
+# Off unless PYNN_TIMING=1 (all sessions) or ?timing=1 in the app URL (one session).
+TIMING = os.environ.get("PYNN_TIMING", "") not in ("", "0")
+TIMING_LOG = os.environ.get("PYNN_TIMING_LOG")  # append one JSON line per timed rerun
+_timing = threading.local()
+_timing_log_lock = threading.Lock()
+
+class StageTimer:
+    """Timed stages of one rerun (or any block of work) on the current thread.
 
-    # NEW customers per month (acquisitions)
-    S_new_per_month: int = 50
-    G_new_per_month: int = 50
+    Inside `with timer:` it is the thread's active timer: `timed` functions record their calls
+    and `lap(name)` closes a section running since the previous lap. Events are
+    (name, kind, start s, duration s, extra) with start relative to entering the timer.
+    """
 
-    # Company finance (EUR per month except value)
-    base_costs_eur: float = 10_000.0
-    marketing_costs_eur: float = 5_000.0
-    company_value_eur: float = 2_500_000.0  # absolute EUR
-    discount_rate_pct: float = 10.0         # annual percent
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.events: list = []
+        self.total = 0.0
+
+    def __enter__(self) -> "StageTimer":
+        self._prev = getattr(_timing, "timer", None)
+        _timing.timer = self
+        self.wall = time.time()
+        self.t0 = self._lap = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.total = time.perf_counter() - self.t0
+        _timing.timer = self._prev
+
+    @contextmanager
+    def stage(self, name: str, kind: str = "call", **extra):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.events.append((name, kind, t - self.t0, time.perf_counter() - t, extra or None))
+
+    def lap(self, name: str, **extra) -> None:
+        now = time.perf_counter()
+        self.events.append((name, "section", self._lap - self.t0, now - self._lap, extra or None))
+        self._lap = now
+
+    def breakdown(self) -> pd.DataFrame:
+        """Per stage name: kind, calls, total/max ms, share of the rerun and payload bytes."""
+        rows = {}
+        for name, kind, _, dur, extra in self.events:
+            r = rows.setdefault(name, {"Stage": name, "Kind": kind, "Calls": 0, "Total ms": 0.0, "Max ms": 0.0, "Bytes": 0})
+            r["Calls"] += 1
+            r["Total ms"] += dur * 1e3
+            r["Max ms"] = max(r["Max ms"], dur * 1e3)
+            r["Bytes"] += (extra or {}).get("bytes", 0)
+        out = pd.DataFrame(list(rows.values()), columns=["Stage", "Kind", "Calls", "Total ms", "Max ms", "Bytes"])
+        out["Share"] = out["Total ms"] / (self.total * 1e3) if self.total else 0.0
+        return out.sort_values("Total ms", ascending=False, ignore_index=True)
+
+    def record(self, **meta) -> dict:
+        """JSON-ready record of this rerun; `meta` adds fields such as session id or cache stats."""
+        return {"ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.wall)), "epoch_ms": self.wall * 1e3,
+                "label": self.label, "total_ms": self.total * 1e3, **meta,
+                "stages": [{"name": n, "kind": k, "start_ms": s * 1e3, "ms": d * 1e3, **(x or {})}
+                           for n, k, s, d, x in self.events]}
+
+def active_timer() -> Optional[StageTimer]:
+    return getattr(_timing, "timer", None)
+
+def timed(fn: Callable) -> Callable:
+    """Record calls of `fn` in the thread's active StageTimer; a single attribute lookup when off."""
+    name = fn.__qualname__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        timer = getattr(_timing, "timer", None)
+        if timer is None:
+            return fn(*args, **kwargs)
+        with timer.stage(name):
+            return fn(*args, **kwargs)
+    return wrapper
+
+def lap(name: str, **extra) -> None:
+    timer = getattr(_timing, "timer", None)
+    if timer is not None:
+        timer.lap(name, **extra)
+
+def append_timing_log(record: dict, path: Optional[str] = TIMING_LOG) -> None:
+    """Append a `StageTimer.record` as one JSON line (safe across sessions of this process)."""
+    if path:
+        with _timing_log_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, default=float) + "\n")
+
+def chrome_trace(records: Sequence[dict], pid: int = 0) -> dict:
+    """Chrome / Perfetto trace ("traceEvents", complete events in µs) from timing records;
+    each session becomes a thread row so traces from several sessions can be merged."""
+    events, tids = [], {}
+    for rec in records:
+        tid = tids.setdefault(rec.get("session", ""), len(tids) + 1)
+        t0 = rec["epoch_ms"] * 1e3
+        for sg in rec["stages"]:
+            extra = {k: v for k, v in sg.items() if k not in ("name", "kind", "start_ms", "ms")}
+            events.append({"name": sg["name"], "cat": sg["kind"], "ph": "X", "pid": pid, "tid": tid,
+                           "ts": t0 + sg["start_ms"] * 1e3, "dur": sg["ms"] * 1e3, "args": extra})
+    events += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": f"session {sid}"}}
+               for sid, tid in tids.items()]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+# --------------------------------- Model --------------------------------- #
+# Frozen, hashable snapshot of a Model's inputs (for cache keys).
+ModelKey = namedtuple("ModelKey", [f.name for f in fields(Model)])
 
-    # Retention (monthly stay probability)
-    retention_startup: float = 0.92
-    retention_investor: float = 0.92
+def model_key(m: Model) -> ModelKey:
+    return ModelKey(*astuple(m))
 
 
 # ------------------------------- Calculations ------------------------------ #
@@ -79,8 +259,28 @@ def monthly_required_eur(m: Model) -> float:
     r_annual = m.discount_rate_pct / 100.0
     return (m.base_costs_eur + m.marketing_costs_eur) + (r_annual * m.company_value_eur) / 12.0
 
+def model_actives(m: Model, months: int) -> np.ndarray:
+    """Actives per segment and month (K × T): closed form for constant acquisitions, the cohort
+    convolution (`cohort_actives`) for segments with an acquisition schedule."""
+    _, new, r = segment_schedules(m, months)
+    if months <= 0:
+        return new
+    act = segment_actives(new[:, 0], r, months)
+    varying = np.any(new != new[:, :1], axis=1)
+    if varying.any():
+        act[varying] = cohort_actives(new[varying], r[varying, None], months)
+    return act
+
 def actives_constant_new(new_per_month: float, r: float, months: int) -> np.ndarray:
-    """Active_t with constant acquisitions and retention r: N * (1 - r^t) / (1 - r), t=1..T."""
+    """Active_t with constant acquisitions and retention r: N * (1 - r^t) / (1 - r), t=1..T.
+
+    Scalars give shape (T,). 1-D arrays for N and/or r give one row per scenario, shape (n, T).
+    """
+    if np.ndim(new_per_month) or np.ndim(r):
+        N, rr = np.broadcast_arrays(np.asarray(new_per_month, dtype=float), np.asarray(r, dtype=float))
+        rr = np.clip(rr, 0.0, 0.9999)[:, None]
+        t = np.arange(1, max(months, 0) + 1)
+        return N[:, None] * (1.0 - rr ** t) / (1.0 - rr)
     if months <= 0:
         return np.zeros(0)
     t = np.arange(1, months + 1)
@@ -88,41 +288,101 @@ def actives_constant_new(new_per_month: float, r: float, months: int) -> np.ndar
     # When r == 0 → Active_t = N (only the newest month remains)
     return new_per_month * (1.0 - (r ** t)) / (1.0 - r) if r != 1.0 else new_per_month * t
 
-def project_timeline(m: Model, months: int) -> pd.DataFrame:
-    """Monthly projection with accumulation via retention."""
-    act_S = actives_constant_new(m.S_new_per_month, m.retention_startup, months)
-    act_G = actives_constant_new(m.G_new_per_month, m.retention_investor, months)
+def segment_actives(new_per_month, r, months: int) -> np.ndarray:
+    """`actives_constant_new` for all segments at once: (..., K) acquisitions and retentions
+    → (..., K, T) actives, one broadcast over segments × months (× scenarios)."""
+    N, rr = np.broadcast_arrays(np.asarray(new_per_month, dtype=float), np.asarray(r, dtype=float))
+    rr = np.clip(rr, 0.0, 0.9999)[..., None]
+    t = np.arange(1, max(months, 0) + 1)
+    return N[..., None] * (1.0 - rr ** t) / (1.0 - rr)
 
-    price_S, price_G = m.price_startup_eur, m.price_investor_eur
-    revenue = act_S * price_S + act_G * price_G
-    required = np.full(months, monthly_required_eur(m))
-    net = revenue - required
-    cum_net = np.cumsum(net)
+def segment_column(s: Segment) -> str:
+    return f"Active {s.name}"
+
+@timed
+def project_timeline(m: Model, months: int, backend: str = "pandas", dtype=np.float64,
+                     columns: Optional[Sequence[str]] = None):
+    """Monthly projection with accumulation via retention.
 
+    `backend` picks the container (see `timeline_as`); `dtype=np.float32` halves the memory of the
+    value columns and `columns` keeps only the named ones (Month is always included).
+    """
+    return _timeline_frame(m, months, model_actives(m, months), backend, dtype, columns)
+
+def _discount_factors(m: Model, months: int) -> np.ndarray:
     # monthly discount factor (simple) from annual rate
     d = (m.discount_rate_pct / 100.0) / 12.0
-    df = 1.0 / ((1.0 + d) ** np.arange(1, months + 1))
+    return 1.0 / ((1.0 + d) ** np.arange(1, months + 1))
+
+def _timeline_frame(m: Model, months: int, actives: np.ndarray,
+                    backend: str = "pandas", dtype=np.float64, columns: Optional[Sequence[str]] = None,
+                    required: Optional[np.ndarray] = None, df: Optional[np.ndarray] = None):
+    """Revenue, required, net, cumulative net and NPV(Net) columns on top of given (K × T) actives,
+    one row per `model_segments(m)` (and, optionally, precomputed required and discount-factor vectors).
+    Prices and costs follow the Model's schedules."""
+    segs = model_segments(m)
+    actives = np.asarray(actives, dtype=float).reshape(len(segs), months)
+    revenue = np.einsum("kt,kt->t", segment_schedules(m, months)[0], actives)
+    if required is None:
+        required = required_by_month(m, months)
+    net = revenue - required
+    cum_net = np.cumsum(net)
+
+    if df is None:
+        df = _discount_factors(m, months)
     npv_net = net * df
 
-    return pd.DataFrame({
+    cols = {
         "Month": np.arange(1, months + 1),
-        "Active S": act_S,
-        "Active G": act_G,
+        **{segment_column(s): a for s, a in zip(segs, actives)},
         "Revenue EUR/mo": revenue,
         "Required EUR/mo": required,
         "Net EUR/mo": net,
         "Cum Net EUR": cum_net,
         "NPV(Net)": npv_net
-    })
+    }
+    if columns is not None:
+        bad = sorted(set(columns) - set(cols))
+        if bad:
+            raise ValueError(f"Unknown timeline column(s): {', '.join(bad)}")
+        cols = {k: v for k, v in cols.items() if k == "Month" or k in columns}
+    return timeline_as(cols, backend, dtype)
+
+TIMELINE_BACKENDS = ("pandas", "numpy", "structured", "arrow")
 
+def timeline_as(cols: dict, backend: str = "pandas", dtype=np.float64):
+    """Package {column: 1-D array} (Month first) as one of TIMELINE_BACKENDS.
+
+    - "pandas": DataFrame (Month int, values `dtype`)
+    - "numpy": 2-D (months × columns) array of `dtype`, columns in dict order
+    - "structured": NumPy record array with named fields (Month int32)
+    - "arrow": pyarrow.Table; float columns without nulls convert to pandas without copying via
+      `table.to_pandas(split_blocks=True)` (needs pyarrow)
+    """
+    vals = {k: (v if k == "Month" else np.asarray(v).astype(dtype, copy=False)) for k, v in cols.items()}
+    if backend == "pandas":
+        return pd.DataFrame(vals)
+    if backend == "numpy":
+        return np.column_stack([np.asarray(v, dtype=dtype) for v in vals.values()])
+    if backend == "structured":
+        out = np.empty(len(vals["Month"]), dtype=[(k, np.int32 if k == "Month" else dtype) for k in vals])
+        for k, v in vals.items():
+            out[k] = v
+        return out
+    if backend == "arrow":
+        import pyarrow as pa
+        return pa.table(vals)
+    raise ValueError(f"backend must be one of {TIMELINE_BACKENDS}")
+
+@timed
 def steady_state_values(m: Model) -> dict:
-    """Steady-state actives and MRR if acquisitions continue forever."""
-    r_s = float(np.clip(m.retention_startup, 0.0, 0.9999))
-    r_g = float(np.clip(m.retention_investor, 0.0, 0.9999))
-    ss_act_S = (m.S_new_per_month / (1.0 - r_s)) if r_s < 1.0 else np.inf
-    ss_act_G = (m.G_new_per_month / (1.0 - r_g)) if r_g < 1.0 else np.inf
-    ss_mrr = ss_act_S * m.price_startup_eur + ss_act_G * m.price_investor_eur
-    return {"ss_act_S": ss_act_S, "ss_act_G": ss_act_G, "ss_mrr": ss_mrr}
+    """Steady-state actives (`ss_act_<segment>`) and MRR if acquisitions continue forever
+    (at the base values; schedules are ignored)."""
+    price, new, r = segment_vectors(m)
+    ss_act = new / (1.0 - np.clip(r, 0.0, 0.9999))
+    out = {f"ss_act_{s.name}": float(a) for s, a in zip(model_segments(m), ss_act)}
+    out["ss_mrr"] = float(price @ ss_act)
+    return out
 
 def break_even_rate_pct(company_value_eur: float, costs_monthly: float, revenue_monthly: float) -> float:
     """r = 12*(rev - costs)/value  → annual %."""
@@ -147,73 +407,856 @@ def months_to_fraction_ss(retention: float, fraction: float = 0.9) -> Optional[i
         return None
 
 
+# ------------------------- Incremental recomputation ----------------------- #
+# Which Model fields feed which intermediate arrays of project_timeline. S/G prices feed none of them
+# nor do extra-segment prices or price schedules: revenue, net and the cumulative/discounted columns
+# are rebuilt on every call (O(K·T) arithmetic). `schedules[f]` is the Schedule of field f (if any),
+# `extra_segments[a]` attribute a over all extra segments (see `_dep_value`).
+TIMELINE_DEPS = {
+    "actives": ("S_new_per_month", "retention_startup", "G_new_per_month", "retention_investor",
+                "extra_segments[new_per_month]", "extra_segments[retention]",
+                "schedules[S_new_per_month]", "schedules[G_new_per_month]"),
+    "discount": ("discount_rate_pct",),
+    "required": ("base_costs_eur", "marketing_costs_eur", "company_value_eur", "discount_rate_pct",
+                 "schedules[base_costs_eur]", "schedules[marketing_costs_eur]"),
+}
+_TIMELINE_PARTS = {
+    "actives": model_actives,
+    "discount": _discount_factors,
+    "required": required_by_month,
+}
+
+def _dep_value(m: Model, dep: str):
+    """Current value of a TIMELINE_DEPS entry: a Model field, or one part of it (`field[key]`)."""
+    name, _, key = dep.partition("[")
+    value = getattr(m, name)
+    if not key:
+        return value
+    key = key.rstrip("]")
+    if name == "schedules":
+        return dict(value).get(key)
+    return tuple(getattr(sg, key) for sg in value)
+
+class IncrementalTimeline:
+    """`project_timeline` that keeps its intermediate arrays and recomputes only the stale ones.
+
+    A part is stale when the horizon or one of its TIMELINE_DEPS fields changed since it was
+    built. `last` records what the latest call reused or recomputed; `reused`/`recomputed`
+    count per part over the object's lifetime.
+    """
+
+    def __init__(self):
+        self._parts: dict = {}
+        self._sigs: dict = {}
+        self.last: dict = {}
+        self.reused = dict.fromkeys(TIMELINE_DEPS, 0)
+        self.recomputed = dict.fromkeys(TIMELINE_DEPS, 0)
+
+    @timed
+    def evaluate(self, m: Model, months: int, **output):
+        for name, deps in TIMELINE_DEPS.items():
+            sig = (months, *(_dep_value(m, d) for d in deps))
+            if self._sigs.get(name) == sig:
+                self.reused[name] += 1
+                self.last[name] = "reused"
+            else:
+                self._parts[name] = _TIMELINE_PARTS[name](m, months)
+                self._sigs[name] = sig
+                self.recomputed[name] += 1
+                self.last[name] = "recomputed"
+        p = self._parts
+        return _timeline_frame(m, months, p["actives"], required=p["required"], df=p["discount"], **output)
+
+    def stats(self) -> dict:
+        return {"last": dict(self.last), "reused": dict(self.reused), "recomputed": dict(self.recomputed)}
+
+
+# ------------------------------ Scenario grids ----------------------------- #
+TIMELINE_COLUMNS = ("Active S", "Active G", "Revenue EUR/mo", "Required EUR/mo",
+                    "Net EUR/mo", "Cum Net EUR", "NPV(Net)")
+MODEL_FIELDS = tuple(f.name for f in fields(Model) if f.name not in ("extra_segments", "schedules"))  # numeric
+# Per-segment parameter arrays over (scenarios × segments): S field, G field, extra-segment key.
+_SEGMENTS = (("price_startup_eur", "price_investor_eur", "extra_price_eur"),
+             ("S_new_per_month", "G_new_per_month", "extra_new_per_month"),
+             ("retention_startup", "retention_investor", "extra_retention"))
+GRID_CHUNK = 8192  # scenarios per block → ~8 MB per (chunk × 120 months) float64 temporary
+
+def scenario_params(models: Optional[Sequence[Model]] = None, **overrides) -> dict:
+    """Model fields as 1-D float arrays over a common scenario axis.
+
+    Values come from `models` (default: one `Model()`); keyword overrides (scalars or 1-D arrays,
+    keyed by Model field name) replace them. Everything is broadcast to the same length n.
+    Extra segments become (n × E) arrays under "extra_price_eur", "extra_new_per_month" and
+    "extra_retention"; all models must have the same number E of them. Schedules, if any, must be
+    the same for all models and are kept once under "schedules" (they scale each scenario's values).
+    """
+    unknown = sorted(set(overrides) - set(MODEL_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown Model field(s): {', '.join(unknown)}")
+    models = list(models) if models is not None else [Model()]
+    cols = {k: np.array([getattr(mm, k) for mm in models], dtype=float) for k in MODEL_FIELDS}
+    cols.update({k: np.atleast_1d(np.asarray(v, dtype=float)) for k, v in overrides.items()})
+    if any(v.ndim != 1 for v in cols.values()):
+        raise ValueError("Scenario parameters must be scalars or 1-D arrays.")
+    cols = dict(zip(cols, np.broadcast_arrays(*cols.values())))
+    n_extra = {len(mm.extra_segments) for mm in models}
+    if len(n_extra) > 1:
+        raise ValueError("All models must have the same number of extra segments.")
+    extra = np.array([[(s.price_eur, s.new_per_month, s.retention) for s in mm.extra_segments] for mm in models],
+                     dtype=float).reshape(len(models), n_extra.pop(), 3)
+    shape = (n_scenarios(cols), extra.shape[1])
+    for i, (*_, k) in enumerate(_SEGMENTS):
+        cols[k] = np.broadcast_to(extra[..., i], shape)
+    schedules = {mm.schedules for mm in models}
+    if len(schedules) > 1:
+        raise ValueError("All models must have the same schedules.")
+    schedules = schedules.pop()
+    if schedules:
+        scheduled(schedules, SCHEDULE_FIELDS[0], 0.0, 0)  # validates the field names
+        cols["schedules"] = schedules
+    return cols
+
+def n_scenarios(p: dict) -> int:
+    return len(next(iter(p.values())))
+
+def _take(p: dict, idx) -> dict:
+    """Scenario subset/reordering of `p` (schedules are shared, not per scenario)."""
+    return {k: (v if k == "schedules" else v[idx]) for k, v in p.items()}
+
+def segment_grid(p: dict) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(price, new per month, retention) as (n × K) arrays: S, G, then the extra segments.
+    Retention is clipped to [0, 0.9999]."""
+    price, new, r = (np.column_stack([p[s], p[g], p[x]]) for s, g, x in _SEGMENTS)
+    return price, new, np.clip(r, 0.0, 0.9999)
+
+def iter_project_grid(p: dict, months: int, chunk_size: int = GRID_CHUNK,
+                      columns: Sequence[str] = TIMELINE_COLUMNS) -> Iterator[tuple[slice, dict]]:
+    """Vectorized `project_timeline` over scenarios, yielded in blocks of at most `chunk_size` rows.
+
+    Each item is (scenario slice, {column: (rows × months) array}); only `columns` are kept,
+    so peak memory is bounded by the chunk size, not by the number of scenarios. Extra segments
+    count towards revenue (see `_extra_revenue`) but get no actives columns. Schedules turn prices,
+    acquisitions and costs into (rows × months) arrays; scheduled acquisitions use `cohort_actives`.
+    """
+    bad = sorted(set(columns) - set(TIMELINE_COLUMNS))
+    if bad:
+        raise ValueError(f"Unknown timeline column(s): {', '.join(bad)}")
+    t = np.arange(1, months + 1)
+    n = n_scenarios(p)
+    for lo in range(0, n, max(int(chunk_size), 1)):
+        sl = slice(lo, min(lo + int(chunk_size), n))
+        q = _take(p, sl)
+        sched = dict(q.get("schedules", ()))
+        price, new, r = segment_grid(q)
+        extra = _extra_revenue(price[:, 2:], new[:, 2:], r[:, 2:], months)
+        r_annual = q["discount_rate_pct"] / 100.0
+        if not sched:
+            act = segment_actives(new[:, :2], r[:, :2], months)
+            revenue = np.einsum("nk,nkt->nt", price[:, :2], act) + extra
+            req = ((q["base_costs_eur"] + q["marketing_costs_eur"]) + (r_annual * q["company_value_eur"]) / 12.0)[:, None]
+        else:
+            price_t = np.stack([scheduled(sched, f, q[f], months) for f in _SEGMENTS[0][:2]], axis=1)
+            act = segment_actives(new[:, :2], r[:, :2], months)
+            for k, f in enumerate(_SEGMENTS[1][:2]):
+                if f in sched:
+                    act[:, k] = _scheduled_actives(sched[f], new[:, k], r[:, k], months)
+            revenue = np.einsum("nkt,nkt->nt", price_t, act) + extra
+            req = (scheduled(sched, "base_costs_eur", q["base_costs_eur"], months)
+                   + scheduled(sched, "marketing_costs_eur", q["marketing_costs_eur"], months)
+                   + (r_annual * q["company_value_eur"] / 12.0)[:, None])
+        net = revenue - req
+        block = {"Active S": act[:, 0], "Active G": act[:, 1], "Revenue EUR/mo": revenue, "Net EUR/mo": net}
+        if "Required EUR/mo" in columns:
+            block["Required EUR/mo"] = np.broadcast_to(req, net.shape)
+        if "Cum Net EUR" in columns:
+            block["Cum Net EUR"] = np.cumsum(net, axis=1)
+        if "NPV(Net)" in columns:
+            d = (r_annual / 12.0)[:, None]
+            block["NPV(Net)"] = net / (1.0 + d) ** t
+        yield sl, {c: block[c] for c in columns}
+
+def _scheduled_actives(schedule: Schedule, new: np.ndarray, r: np.ndarray, months: int) -> np.ndarray:
+    """(rows × T) actives for base acquisitions `new` (rows,) under `schedule` with retention r (rows,).
+
+    The schedule's profile is shared by all rows and actives are linear in the base, so the cohort
+    convolution runs once per distinct retention and is scaled per row.
+    """
+    r_u, inv = np.unique(r, return_inverse=True)
+    unit = cohort_actives(schedule.values(1.0, months), r_u[:, None], months)[inv]
+    return unit if schedule.series else unit * new[:, None]
+
+def _extra_revenue(price: np.ndarray, new: np.ndarray, r: np.ndarray, months: int) -> np.ndarray:
+    """Σ over (rows × E) segments of price · actives, as (rows × months) (or a broadcastable (months,)).
+
+    Segments with the same parameters in every row are summed once over months and broadcast;
+    only the per-row ones are expanded to (rows × segments × months).
+    """
+    same = np.all((price == price[:1]) & (new == new[:1]) & (r == r[:1]), axis=0)
+    out = price[0, same] @ segment_actives(new[0, same], r[0, same], months) if len(price) else np.zeros(months)
+    if not same.all():
+        out = out + np.einsum("nk,nkt->nt", price[:, ~same], segment_actives(new[:, ~same], r[:, ~same], months))
+    return out
+
+def project_grid(p: dict, months: int, chunk_size: int = GRID_CHUNK,
+                 columns: Sequence[str] = TIMELINE_COLUMNS, dtype=np.float64) -> dict:
+    """Batched `project_timeline`: {column: (scenarios × months) array} for the scenarios in `p`.
+
+    Blocks are computed in float64; `dtype=np.float32` halves the memory of the stored result.
+    """
+    n = n_scenarios(p)
+    out = {c: np.empty((n, months), dtype=dtype) for c in columns}
+    for sl, block in iter_project_grid(p, months, chunk_size, columns):
+        for c in columns:
+            out[c][sl] = block[c]
+    return out
+
+
+# --------------------------------- Solvers -------------------------------- #
+def _required_grid(p: dict) -> np.ndarray:
+    return (p["base_costs_eur"] + p["marketing_costs_eur"]) + (p["discount_rate_pct"] / 100.0 * p["company_value_eur"]) / 12.0
+
+def _revenue_fns(p: dict, months: int) -> tuple[Callable, Callable]:
+    """Closed-form revenue(t) = Σ price · N · (1 - r^t) / (1 - r) and cumulative revenue
+    Σ_(k≤t) revenue_k = Σ price · N / (1 - r) · (t - r (1 - r^t) / (1 - r)) for integer t ≤ months.
+
+    Segments with the same parameters in every scenario (e.g. extra segments broadcast from one
+    Model) are merged by retention into one weight per distinct r, so adding them costs O(distinct r)
+    per evaluation, not an (scenarios × segments) array; only the per-scenario segments are
+    evaluated element-wise. Both stay O(1) in `months`.
+    """
+    price, N, r = segment_grid(p)
+    same = np.all((price == price[:1]) & (N == N[:1]) & (r == r[:1]), axis=0)
+    w, rv = price[:, ~same] * N[:, ~same], r[:, ~same]
+    rs, inv = np.unique(r[0, same], return_inverse=True)
+    ws = np.bincount(inv.ravel(), (price[0, same] * N[0, same]), minlength=len(rs))
+
+    def revenue(t: np.ndarray) -> np.ndarray:
+        tc = np.asarray(t, dtype=np.int64)[:, None]
+        return (np.sum(w * (1.0 - rv ** tc) / (1.0 - rv), axis=1)
+                + np.sum(ws * (1.0 - rs ** tc) / (1.0 - rs), axis=1))
+
+    def cum_revenue(t: np.ndarray) -> np.ndarray:
+        tc = np.asarray(t, dtype=np.int64)[:, None]
+        return (np.sum(w / (1.0 - rv) * (tc - rv * (1.0 - rv ** tc) / (1.0 - rv)), axis=1)
+                + np.sum(ws / (1.0 - rs) * (tc - rs * (1.0 - rs ** tc) / (1.0 - rs)), axis=1))
+
+    return revenue, cum_revenue
+
+def _first_true(pred, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Smallest integer t in [lo, hi] with pred(t), per scenario. pred must be monotone (False → True)
+    on the bracket and true at hi; costs O(log(hi - lo)) vectorized evaluations."""
+    lo, hi = lo.copy(), hi.copy()
+    while np.any(lo < hi):
+        mid = (lo + hi) // 2
+        ok = pred(mid)
+        hi = np.where(ok, mid, hi)
+        lo = np.where(ok, lo, mid + 1)
+    return hi
+
+def _scan_grid(p: dict, months: int) -> dict:
+    """Payback / MRR-break month, NPV(Net) and cumulative net at the horizon by scanning projected
+    timelines block by block. Used when schedules make Net non-monotone and rule out the closed forms."""
+    n = n_scenarios(p)
+    out = {k: np.full(n, np.nan) for k in ("payback_month", "mrr_break_month")}
+    out.update(npv_net=np.zeros(n), cum_net_end=np.zeros(n))
+    if months < 1:
+        return out
+    for sl, b in iter_project_grid(p, months, columns=("Net EUR/mo", "Cum Net EUR", "NPV(Net)")):
+        for k, ok in (("payback_month", b["Cum Net EUR"] >= 0), ("mrr_break_month", b["Net EUR/mo"] >= 0)):
+            out[k][sl] = np.where(ok.any(axis=1), ok.argmax(axis=1) + 1.0, np.nan)
+        out["npv_net"][sl] = b["NPV(Net)"].sum(axis=1)
+        out["cum_net_end"][sl] = b["Cum Net EUR"][:, -1]
+    return out
+
+@timed
+def solve_mrr_break_month(p: dict, months: int) -> np.ndarray:
+    """First month with Revenue ≥ Required per scenario (NaN if not within `months`), without timelines.
+
+    Revenue is non-decreasing in t, so the month is found by bisection on the closed form
+    (scheduled scenarios are scanned instead, see `_scan_grid`).
+    """
+    n = n_scenarios(p)
+    if n == 0:
+        return np.empty(0)
+    if p.get("schedules"):
+        return _scan_grid(p, months)["mrr_break_month"]
+    req = _required_grid(p)
+    lo, hi = np.ones(n, dtype=np.int64), np.full(n, max(int(months), 1), dtype=np.int64)
+    revenue_at, _ = _revenue_fns(p, months)
+    reached = revenue_at(hi) >= req
+    out = _first_true(lambda t: (revenue_at(t) >= req) | ~reached, lo, hi).astype(float)
+    out[~reached | (months < 1)] = np.nan
+    return out
+
+@timed
+def solve_payback_month(p: dict, months: int) -> np.ndarray:
+    """First month with Cum Net ≥ 0 per scenario (NaN if not within `months`), without timelines.
+
+    Cum Net starts at 0 and falls while Net < 0, so it can only turn non-negative from the
+    MRR-break month on, where it is non-decreasing: bisect the closed-form cumulative sum there.
+    Scheduled scenarios are scanned instead (see `_scan_grid`).
+    """
+    if n_scenarios(p) == 0:
+        return np.empty(0)
+    if p.get("schedules"):
+        return _scan_grid(p, months)["payback_month"]
+    req = _required_grid(p)
+    _, cum_revenue_at = _revenue_fns(p, months)
+    cum_at = lambda t: cum_revenue_at(t) - t * req >= 0
+    start = solve_mrr_break_month(p, months)
+    hi = np.full(n_scenarios(p), max(int(months), 1), dtype=np.int64)
+    reached = ~np.isnan(start) & cum_at(hi)
+    lo = np.where(reached, np.nan_to_num(start, nan=1.0), hi).astype(np.int64)
+    out = _first_true(lambda t: cum_at(t) | ~reached, lo, hi).astype(float)
+    out[~reached] = np.nan
+    return out
+
+def _geom_sum(log_v: np.ndarray, months: int) -> np.ndarray:
+    """Σ_(t=1..T) v^t from log v, as v · expm1(T log v) / expm1(log v).
+
+    Stable for v → 1 (tiny discount rates); only log v == 0 exactly takes the limit T.
+    """
+    log_v = np.asarray(log_v, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = np.exp(log_v) * np.expm1(months * log_v) / np.expm1(log_v)
+    return np.where(log_v == 0.0, float(months), s)
+
+@timed
+def npv_total_grid(p: dict, months: int) -> np.ndarray:
+    """Closed-form Σ NPV(Net) over the horizon per scenario, O(1) in `months` (scanned if scheduled)."""
+    if p.get("schedules"):
+        return _scan_grid(p, months)["npv_net"]
+    log_v = -np.log1p((p["discount_rate_pct"] / 100.0) / 12.0)
+    gv = _geom_sum(log_v, months)
+    price, N, r = segment_grid(p)
+    with np.errstate(divide="ignore"):
+        log_rv = np.log(r) + log_v[:, None]  # r = 0 → -inf → Σ = 0
+    seg = price * N / (1.0 - r) * (gv[:, None] - _geom_sum(log_rv, months))
+    return seg.sum(axis=1) - _required_grid(p) * gv
+
+def steady_state_mrr_grid(p: dict) -> np.ndarray:
+    """Vectorized `steady_state_values(...)["ss_mrr"]`: Σ price · N / (1 - r) over segments,
+    at the base (unscheduled) values."""
+    price, N, r = segment_grid(p)
+    return np.sum(price * N / (1.0 - r), axis=1)
+
+def month_or_none(x: float) -> Optional[int]:
+    return None if np.isnan(x) else int(x)
+
+
+# ------------------------------ Cohort engine ------------------------------ #
+def survival_by_age(retention_by_age, months: int) -> np.ndarray:
+    """Share of a cohort still active at age a = 0..T-1 (age 0 = month of acquisition).
+
+    `retention_by_age[k]` is the stay probability from age k to k+1 and the last value repeats,
+    e.g. [0.60, 0.75, 0.85, 0.95] = heavy churn in months 1–3, then flat at 0.95.
+    Rows of a 2-D input are separate scenarios.
+    """
+    R = np.clip(np.atleast_1d(np.asarray(retention_by_age, dtype=float)), 0.0, 0.9999)
+    n_steps = max(months - 1, 0)
+    if R.shape[-1] < n_steps:
+        R = np.concatenate([R, np.repeat(R[..., -1:], n_steps - R.shape[-1], axis=-1)], axis=-1)
+    R = R[..., :n_steps]
+    return np.concatenate([np.ones(R.shape[:-1] + (1,)), np.cumprod(R, axis=-1)], axis=-1)
+
+def cohort_actives(new, retention_by_age, months: int) -> np.ndarray:
+    """Active_t = Σ_a new_(t-a) · S(a): acquisitions convolved with the survival curve.
+
+    `new` is a scalar, a (T,) vector or an (n, T) matrix of acquisitions per month; the retention
+    curve is (K,) or (n, K). The convolution runs as an FFT along the month axis, O(T log T) per
+    scenario instead of an O(T²) cohort loop. Output is (T,) or (n, T).
+    """
+    new = np.asarray(new, dtype=float)
+    if new.ndim == 0:
+        new = np.full(months, float(new))
+    if new.shape[-1] != months:
+        raise ValueError(f"Acquisition vector has {new.shape[-1]} months, expected {months}.")
+    S = survival_by_age(retention_by_age, months)
+    nfft = 1 << max(2 * months - 1, 1).bit_length()
+    act = np.fft.irfft(np.fft.rfft(new, nfft) * np.fft.rfft(S, nfft), nfft)[..., :months]
+    return np.maximum(act, 0.0)  # drop FFT round-off below zero
+
+@timed
+def project_timeline_cohort(m: Model, months: int, new_S=None, new_G=None,
+                            retention_by_age_S=None, retention_by_age_G=None, **output):
+    """`project_timeline` with per-month acquisition vectors and retention-by-age curves.
+
+    Anything left as None falls back to the Model's (scheduled) S_new/G_new and flat retention;
+    extra segments use their closed form. `output` takes project_timeline's backend/dtype/columns.
+    """
+    _, new, r = segment_schedules(m, months)
+    act = model_actives(m, months)
+    if new_S is not None or retention_by_age_S is not None:
+        act[0] = cohort_actives(new[0] if new_S is None else new_S,
+                                r[0] if retention_by_age_S is None else retention_by_age_S, months)
+    if new_G is not None or retention_by_age_G is not None:
+        act[1] = cohort_actives(new[1] if new_G is None else new_G,
+                                r[1] if retention_by_age_G is None else retention_by_age_G, months)
+    return _timeline_frame(m, months, act, **output)
+
+
+# ------------------------------- Monte Carlo ------------------------------- #
+@timed
+def monte_carlo(m: Model, months: int, n_paths: int = 100_000, seed: int = 0,
+                batch_size: int = MC_BATCH, workers: int = 1,
+                quantiles: Sequence[float] = (10, 50, 90)) -> dict:
+    """Stochastic counterpart of `project_timeline`: percentiles over `n_paths` seeded paths.
+
+    Paths are split into batches with independent child seeds, so results do not depend on
+    `workers` (>1 runs batches on a process pool). Returns payback-month, cumulative-net and
+    NPV(Net) percentiles at the horizon, the share of paths that pay back, and the mean/std
+    of cumulative net per month.
+    """
+    jobs = mc_batches(m, months, n_paths, seed, batch_size)
+    from concurrent.futures import ProcessPoolExecutor
+    ex = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(jobs) > 1 else None
+    try:
+        results = list(ex.map(_mc_batch_star, jobs) if ex else map(_mc_batch_star, jobs))
+    finally:
+        if ex:
+            ex.shutdown()
+    return mc_combine(results, months, n_paths, quantiles)
+
+
+
+# ------------------------------- Sensitivity ------------------------------- #
+SENSITIVITY_FIELDS = MODEL_FIELDS
+_RETENTION_FIELDS = ("retention_startup", "retention_investor")  # stepped by ±rel_step of churn (1 - r)
+
+@timed
+def sensitivity(m: Model, months: int, rel_step: float = 0.10,
+                fields: Sequence[str] = SENSITIVITY_FIELDS) -> pd.DataFrame:
+    """One-at-a-time ±rel_step sensitivity of NPV(Net), payback month and SS MRR per Model field.
+
+    The base model and all 2·F perturbed models are evaluated in one batched projection.
+    Retention is stepped by ±rel_step of its churn (1 - r) so it stays below 1. Elasticities are
+    central differences (Δf / f) / (Δx / x); rows are sorted by NPV swing.
+    """
+    base = scenario_params([m])
+    n = 2 * len(fields) + 1
+    p = _take(base, np.zeros(n, dtype=np.intp))
+    lows, highs = [], []
+    for i, f in enumerate(fields):
+        x = float(getattr(m, f))
+        h = (1.0 - x if f in _RETENTION_FIELDS else abs(x)) * rel_step
+        lows.append(max(x - h, 0.0))
+        highs.append(min(x + h, 0.9999) if f in _RETENTION_FIELDS else x + h)
+        p[f][1 + 2 * i], p[f][2 + 2 * i] = lows[-1], highs[-1]
+
+    npv = project_grid(p, months, columns=("NPV(Net)",))["NPV(Net)"].sum(axis=1)
+    payback = solve_payback_month(p, months)
+    ss_mrr = steady_state_mrr_grid(p)
+
+    x0 = np.array([float(getattr(m, f)) for f in fields])
+    lows, highs = np.array(lows), np.array(highs)
+    dx = highs - lows
+    out = {"Field": list(fields), "Base": x0, "Low": lows, "High": highs}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for name, v in (("NPV", npv), ("Payback", payback), ("SS MRR", ss_mrr)):
+            v_lo, v_hi = v[1::2], v[2::2]
+            out[f"{name} low"], out[f"{name} high"] = v_lo, v_hi
+            out[f"Elasticity {name}"] = np.where(dx > 0, (v_hi - v_lo) / dx * x0 / v[0], 0.0)
+    res = pd.DataFrame(out)
+    res.insert(7, "NPV swing", np.abs(res["NPV high"] - res["NPV low"]))
+    res.attrs.update(base_npv=float(npv[0]), base_payback=month_or_none(payback[0]),
+                     base_ss_mrr=float(ss_mrr[0]), rel_step=rel_step)
+    return res.sort_values("NPV swing", ascending=False, ignore_index=True)
+
+
+# -------------------------------- Goal seek -------------------------------- #
+_INT_FIELDS = tuple(f.name for f in fields(Model) if f.type in (int, "int"))
+
+def goal_constraints_met(p: dict, months: int, payback_by: Optional[int] = None,
+                         mrr_break_by: Optional[int] = None, min_npv: Optional[float] = None) -> np.ndarray:
+    """Per-scenario bool: payback by month X, MRR ≥ Required by month Y and NPV(Net) ≥ floor (all given ones)."""
+    ok = np.ones(n_scenarios(p), dtype=bool)
+    if payback_by is not None:
+        ok &= solve_payback_month(p, min(int(payback_by), months)) <= payback_by  # NaN → False
+    if mrr_break_by is not None:
+        ok &= solve_mrr_break_month(p, min(int(mrr_break_by), months)) <= mrr_break_by
+    if min_npv is not None:
+        ok &= npv_total_grid(p, months) >= min_npv
+    return ok
+
+@timed
+def goal_seek(m: Model, field: str, months: int, sense: str = "min",
+              lo: float = 0.0, hi: Optional[float] = None, grid: int = 64, rel_tol: float = 1e-6,
+              **constraints) -> Optional[float]:
+    """Smallest (sense="min") or largest (sense="max") value of `field` that meets all `constraints`.
+
+    Constraints are those of `goal_constraints_met` and must be monotone in `field` over [lo, hi]
+    (default hi: 10× the current value, 0.9999 for retention). Each round evaluates `grid`
+    candidates in one batched call and keeps the grid cell where feasibility flips, so the bracket
+    shrinks by `grid`× per round. Integer fields are rounded towards the feasible side.
+    Returns None if no value in [lo, hi] is feasible.
+    """
+    if field not in MODEL_FIELDS:
+        raise ValueError(f"Unknown Model field: {field}")
+    if sense not in ("min", "max"):
+        raise ValueError("sense must be 'min' or 'max'")
+    if hi is None:
+        hi = 0.9999 if field in _RETENTION_FIELDS else max(10.0 * abs(float(getattr(m, field))), 1.0)
+    base = [m]
+    feasible = lambda xs: goal_constraints_met(scenario_params(base, **{field: xs}), months, **constraints)
+
+    ends = feasible(np.array([lo, hi]))
+    if not (ends[1] if sense == "min" else ends[0]):
+        return None
+    if ends[0] and ends[1]:
+        x = lo if sense == "min" else hi
+    else:
+        while hi - lo > rel_tol * max(abs(lo), abs(hi), 1.0):
+            xs = np.linspace(lo, hi, grid)
+            ok = feasible(xs)
+            if sense == "min":
+                k = int(np.argmax(ok))  # first feasible (hi end is feasible)
+                lo, hi = xs[max(k - 1, 0)], xs[k]
+            else:
+                k = len(ok) - 1 - int(np.argmax(ok[::-1]))  # last feasible (lo end is feasible)
+                lo, hi = xs[k], xs[min(k + 1, len(xs) - 1)]
+            if k in (0, len(xs) - 1) and lo == hi:
+                break
+        x = hi if sense == "min" else lo
+    if field in _INT_FIELDS:
+        x = math.ceil(x - 1e-9) if sense == "min" else math.floor(x + 1e-9)
+    return float(x)
+
+
+# ------------------------------- Result cache ------------------------------ #
+RESULT_CACHE_SIZE = 512          # entries (timelines, steady states, figures)
+RESULT_CACHE_TTL = 30 * 60.0     # seconds; None = never expire
+
+class ResultCache:
+    """Thread-safe LRU cache with optional TTL and hit/miss counters."""
+
+    def __init__(self, maxsize: int = RESULT_CACHE_SIZE, ttl_seconds: Optional[float] = RESULT_CACHE_TTL):
+        self.maxsize, self.ttl_seconds = maxsize, ttl_seconds
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], object]):
+        now = time.monotonic()
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None and (self.ttl_seconds is None or now - hit[0] <= self.ttl_seconds):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return hit[1]
+            self.misses += 1
+        value = compute()  # outside the lock: other sessions keep being served meanwhile
+        with self._lock:
+            self._data[key] = (now, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "size": len(self._data), "maxsize": self.maxsize,
+                    "hit_rate": (self.hits / total) if total else 0.0}
+
+def _new_result_cache() -> ResultCache:
+    return ResultCache()
+
+
+# -------------------------------- Worker pool ------------------------------ #
+POOL_WORKERS = int(os.environ.get("PYNN_WORKERS", "0")) or max((os.cpu_count() or 1) - 1, 1)
+
+class Job:
+    """A computation submitted to a JobPool: one future per chunk plus the step combining their results."""
+
+    def __init__(self, key: Hashable, futures: list, combine: Callable[[list], object]):
+        self.key, self.futures, self.combine = key, futures, combine
+        self.owners: set = set()
+        self.started = time.monotonic()
+
+    @property
+    def progress(self) -> float:
+        return sum(f.done() for f in self.futures) / max(len(self.futures), 1)
+
+    def done(self) -> bool:
+        return all(f.done() for f in self.futures)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        from concurrent.futures import FIRST_EXCEPTION, wait
+        return not wait(self.futures, timeout, return_when=FIRST_EXCEPTION).not_done
+
+    def result(self):
+        return self.combine([f.result() for f in self.futures])
+
+class JobPool:
+    """Process pool shared by all sessions for heavy batch work (Monte Carlo paths).
+
+    Work runs outside the server process, so a large job does not hold the GIL that every
+    session's script thread needs. `submit` returns the running Job for `key` if there is one
+    (identical concurrent requests are computed once) and records `owner` on it; `release`
+    drops the owner and cancels the job's pending chunks once nobody waits for it.
+    """
+
+    def __init__(self, workers: int = POOL_WORKERS):
+        self.workers = workers
+        self._ex = None
+        self._jobs: dict = {}
+        self._lock = threading.Lock()
+        self.submitted = self.deduplicated = self.cancelled = 0
+
+    def _executor(self):
+        if self._ex is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn, not fork: forking a threaded server can copy held locks into the workers
+            self._ex = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._ex
+
+    def submit(self, key: Hashable, owner: Hashable, fn: Callable, chunks: Sequence[tuple],
+               combine: Optional[Callable[[list], object]] = None) -> Job:
+        """Run fn(*args) for each args tuple in `chunks`; `combine` maps the list of chunk results
+        to the job result (default: the single result). `fn` and the args must pickle by reference,
+        so they come from `pynn_model`, not from this script (Streamlit re-runs it as `__main__`)."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None:
+                self.deduplicated += 1
+            else:
+                job = Job(key, [self._executor().submit(fn, *args) for args in chunks],
+                          combine or (lambda results: results[0]))
+                self._jobs[key] = job
+                self.submitted += 1
+            job.owners.add(owner)
+            return job
+
+    def release(self, job: Job, owner: Hashable) -> None:
+        with self._lock:
+            job.owners.discard(owner)
+            if job.owners:
+                return
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+            if not job.done():
+                for f in job.futures:
+                    f.cancel()  # chunks already running finish; their results are dropped
+                self.cancelled += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"workers": self.workers, "running": len(self._jobs), "submitted": self.submitted,
+                    "deduplicated": self.deduplicated, "cancelled": self.cancelled}
+
+def _new_job_pool() -> JobPool:
+    return JobPool()
+
+
 # --------------------------------- Charts --------------------------------- #
 FOOTER = "Made in Boden, Boanova"
+RENDER_MODES = ("auto", "svg", "webgl")
+WEBGL_THRESHOLD = 1_000   # points per figure (series × points) above which "auto" switches to WebGL
+POINT_BUDGET = 1_000      # WebGL mode: LTTB-downsample each trace to at most this many points
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-triangle-three-buckets: indices of `n_out` points that keep the shape of y(x).
+
+    First and last points are always kept; each interior bucket keeps the point forming the
+    largest triangle with the previously kept point and the mean of the next bucket.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+def _use_webgl(render: str, n_points: int) -> bool:
+    """Whether to draw with WebGL; `n_points` counts all points of the figure, not one trace."""
+    if render not in RENDER_MODES:
+        raise ValueError(f"render must be one of {RENDER_MODES}")
+    return render == "webgl" or (render == "auto" and n_points > WEBGL_THRESHOLD)
+
+def _net_colors(net: np.ndarray) -> np.ndarray:
+    return np.where(np.asarray(net) >= 0, "rgba(33,150,83,0.45)", "rgba(244,67,54,0.45)")
+
+# Figure templates: layouts are written once as plain dicts; each render only swaps trace data,
+# shapes and a few annotation values, and skips plotly's per-property validation.
+VALIDATE_FIGURES = os.environ.get("PYNN_VALIDATE_FIGURES") == "1"  # dev check of the hand-written dicts
+_TEMPLATE_JSON: dict = {}
+
+def _resolved_template(name: str) -> dict:
+    if name not in _TEMPLATE_JSON:
+        import plotly.io as pio
+        _TEMPLATE_JSON[name] = pio.templates[name].to_plotly_json()
+    return _TEMPLATE_JSON[name]
+
+class FigureTemplate:
+    """Static layout of one chart kind; `render` fills in traces, shapes and annotations."""
+
+    def __init__(self, footer_y: float = -0.18, template: str = "plotly_white", **layout):
+        self.template = template
+        self.layout = dict(layout, margin=dict(l=60, r=20, t=60, b=60),
+                           legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0))
+        self.footer = dict(x=0.5, y=footer_y, xref="paper", yref="paper", text=FOOTER, showarrow=False,
+                           font=dict(size=12, color="#808080"))
+
+    def render(self, traces: Sequence[dict], shapes: Sequence[dict] = (), annotations: Sequence[dict] = (),
+               **layout) -> go.Figure:
+        lay = dict(self.layout, template=_resolved_template(self.template), **layout)
+        lay["shapes"] = list(shapes)
+        lay["annotations"] = [*annotations, self.footer]
+        return go.Figure(data=list(traces), layout=lay, _validate=VALIDATE_FIGURES)
+
+def _hline(y: float, color: str, dash: str, text: Optional[str] = None, top: bool = True) -> tuple[dict, list]:
+    shape = dict(type="line", xref="x domain", x0=0, x1=1, yref="y", y0=y, y1=y, line=dict(color=color, dash=dash))
+    ann = [dict(text=text, x=0, xanchor="left", xref="x domain", y=y, yanchor="bottom" if top else "top",
+                yref="y", showarrow=False)] if text else []
+    return shape, ann
+
+def _vline(x: float, color: str, dash: str) -> dict:
+    return dict(type="line", xref="x", x0=x, x1=x, yref="y domain", y0=0, y1=1, line=dict(color=color, dash=dash))
 
+def _note(x: float, y: float, text: str, color: str, size: int = 11) -> dict:
+    return dict(x=x, y=y, xref="x", yref="y", text=text, showarrow=False, font=dict(size=size, color=color))
+
+TPL_OVERVIEW = FigureTemplate(
+    footer_y=-0.2, title=dict(text="Revenue vs Required — EUR per month (selected month)"),
+    barmode="group", hovermode="x")
+TPL_ACTIVES = FigureTemplate(
+    title=dict(text="Active Customers over Time (stacked by segment) — accumulation with retention"),
+    xaxis=dict(title=dict(text="Month")), yaxis=dict(title=dict(text="Active customers")), hovermode="x unified")
+TPL_FINANCE = FigureTemplate(
+    title=dict(text="MRR vs Required over Time (with Steady-State)"),
+    xaxis=dict(title=dict(text="Month")), yaxis=dict(title=dict(text="EUR per month")), hovermode="x unified")
+TPL_NET_CUM = FigureTemplate(
+    title=dict(text="Net & Cumulative Net over Time"),
+    xaxis=dict(title=dict(text="Month")), yaxis=dict(title=dict(text="EUR")), hovermode="x unified", barmode="overlay")
+
+@timed
 def chart_overview_month(rev: float, req: float) -> go.Figure:
     gap = rev - req
     over = gap >= 0
     ymax = max(rev, req) * 1.25 if max(rev, req) > 0 else 1.0
-
-    fig = go.Figure()
-    fig.add_trace(go.Bar(name="Revenue (EUR / month)", x=["This month"], y=[rev]))
-    fig.add_trace(go.Bar(name="Required (EUR / month)", x=["This month"], y=[req]))
-    fig.update_layout(
-        title="Revenue vs Required — EUR per month (selected month)",
-        barmode="group", hovermode="x", template="plotly_white",
-        margin=dict(l=60, r=20, t=60, b=60),
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
+    return TPL_OVERVIEW.render(
+        [dict(type="bar", name="Revenue (EUR / month)", x=["This month"], y=[rev], hovertemplate="%{y:,.0f} EUR"),
+         dict(type="bar", name="Required (EUR / month)", x=["This month"], y=[req], hovertemplate="%{y:,.0f} EUR")],
+        annotations=[_note(0, ymax * 0.98, f"{abs(gap):,.0f} EUR {'surplus' if over else 'needed'}",
+                           "green" if over else "crimson", size=14)],
         yaxis=dict(range=[0, ymax], tickformat=",.0f"),
     )
-    fig.update_traces(hovertemplate="%{y:,.0f} EUR")
-    fig.add_annotation(
-        x=0, y=ymax*0.98, xref="x", yref="y",
-        text=f"{abs(gap):,.0f} EUR {'surplus' if over else 'needed'}",
-        showarrow=False, font=dict(color=("green" if over else "crimson"), size=14)
-    )
-    fig.add_annotation(
-        x=0.5, y=-0.2, xref="paper", yref="paper",
-        text=FOOTER,
-        showarrow=False, font=dict(size=12, color="#808080")
-    )
-    return fig
 
-def chart_timeline_actives_stacked(df: pd.DataFrame, ss_S: float, ss_G: float) -> go.Figure:
-    x = df["Month"]; yS = df["Active S"]; yG = df["Active G"]
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=x, y=yS, mode="lines", name="Active Startups (S)", stackgroup="one", hovertemplate="%{y:,.0f}"))
-    fig.add_trace(go.Scatter(x=x, y=yG, mode="lines", name="Active Investors (G)", stackgroup="one", hovertemplate="%{y:,.0f}"))
-    fig.add_hline(y=ss_S, line_dash="dot", line_color="#5b9bd5", annotation_text="SS S", annotation_position="top left")
-    fig.add_hline(y=ss_G, line_dash="dot", line_color="#ed7d31", annotation_text="SS G", annotation_position="bottom left")
-    fig.update_layout(
-        title="Active Customers over Time (stacked: S + G) — accumulation with retention",
-        xaxis_title="Month", yaxis_title="Active customers",
-        hovermode="x unified", template="plotly_white",
-        margin=dict(l=60, r=20, t=60, b=60),
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
-    )
-    fig.add_annotation(x=0.5, y=-0.18, xref="paper", yref="paper", text=FOOTER, showarrow=False,
-                       font=dict(size=12, color="#808080"))
-    return fig
+SEGMENT_COLORS = ("#5b9bd5", "#ed7d31", "#70ad47", "#ffc000", "#7f6bb3", "#c0504d", "#4bacc6", "#9c6b4e")
+_SEGMENT_LABELS = {"S": "Active Startups (S)", "G": "Active Investors (G)"}
 
-def chart_timeline_finance(df: pd.DataFrame, ss_mrr: float, mrr_break_month: Optional[int], payback_month: Optional[int]) -> go.Figure:
-    x = df["Month"]; rev = df["Revenue EUR/mo"]; req = df["Required EUR/mo"]
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=x, y=rev, mode="lines+markers", name="Revenue EUR/mo", hovertemplate="%{y:,.0f} EUR"))
-    fig.add_trace(go.Scatter(x=x, y=req, mode="lines", name="Required EUR/mo", hovertemplate="%{y:,.0f} EUR"))
-    fig.add_hline(y=ss_mrr, line_dash="dot", line_color="#2ca02c", annotation_text="SS MRR", annotation_position="top left")
+@timed
+def chart_timeline_actives_stacked(df: pd.DataFrame, ss_S: float, ss_G: float, render: str = "auto",
+                                   ss_extra: Optional[dict] = None) -> go.Figure:
+    """Stacked actives for every "Active <segment>" column of `df`, with steady-state lines for S, G
+    and the segments in `ss_extra` ({name: steady-state actives})."""
+    names = [c[len("Active "):] for c in df.columns if c.startswith("Active ")]
+    x = df["Month"].to_numpy()
+    Y = df[[f"Active {n}" for n in names]].to_numpy(dtype=float).T
+    if _use_webgl(render, Y.size):  # stacked areas have no WebGL trace; downsample on the total instead
+        keep = lttb_indices(x, Y.sum(axis=0), POINT_BUDGET)
+        x, Y = x[keep], Y[:, keep]
+    ss = {"S": ss_S, "G": ss_G, **(ss_extra or {})}
+    traces, shapes, annotations = [], [], []
+    for i, (name, y) in enumerate(zip(names, Y)):
+        color = SEGMENT_COLORS[i % len(SEGMENT_COLORS)]
+        traces.append(dict(type="scatter", x=x, y=y, mode="lines", name=_SEGMENT_LABELS.get(name, f"Active {name}"),
+                           stackgroup="one", line=dict(color=color), hovertemplate="%{y:,.0f}"))
+        if name in ss:
+            sh, ann = _hline(ss[name], color, "dot", f"SS {name}", top=i % 2 == 0)
+            shapes.append(sh)
+            annotations += ann
+    return TPL_ACTIVES.render(traces, shapes=shapes, annotations=annotations)
+
+@timed
+def chart_timeline_finance(df: pd.DataFrame, ss_mrr: float, mrr_break_month: Optional[int], payback_month: Optional[int],
+                           render: str = "auto") -> go.Figure:
+    x = df["Month"].to_numpy(); rev = df["Revenue EUR/mo"].to_numpy(); req = df["Required EUR/mo"].to_numpy()
+    top = max(rev.max(), req.max())
+    if _use_webgl(render, rev.size + req.size):
+        # one shared index set (the union of both LTTB picks), so the x-unified hover pairs the same month
+        k = np.union1d(lttb_indices(x, rev, POINT_BUDGET // 2), lttb_indices(x, req, POINT_BUDGET // 2))
+        traces = [dict(type="scattergl", x=x[k], y=rev[k], mode="lines", name="Revenue EUR/mo", hovertemplate="%{y:,.0f} EUR"),
+                  dict(type="scattergl", x=x[k], y=req[k], mode="lines", name="Required EUR/mo", hovertemplate="%{y:,.0f} EUR")]
+    else:
+        traces = [dict(type="scatter", x=x, y=rev, mode="lines+markers", name="Revenue EUR/mo", hovertemplate="%{y:,.0f} EUR"),
+                  dict(type="scatter", x=x, y=req, mode="lines", name="Required EUR/mo", hovertemplate="%{y:,.0f} EUR")]
+    shape, annotations = _hline(ss_mrr, "#2ca02c", "dot", "SS MRR", top=True)
+    shapes = [shape]
     if mrr_break_month is not None:
-        fig.add_vline(x=mrr_break_month, line_dash="dot", line_color="#888")
-        fig.add_annotation(x=mrr_break_month, y=max(rev.max(), req.max())*1.02, xref="x", yref="y",
-                           text=f"MRR ≥ Required @ m{mrr_break_month}", showarrow=False, font=dict(size=11, color="#666"))
+        shapes.append(_vline(mrr_break_month, "#888", "dot"))
+        annotations.append(_note(mrr_break_month, top * 1.02, f"MRR ≥ Required @ m{mrr_break_month}", "#666"))
+    if payback_month is not None:
+        shapes.append(_vline(payback_month, "#444", "dash"))
+        annotations.append(_note(payback_month, top * 0.95, f"Payback @ m{payback_month}", "#444"))
+    return TPL_FINANCE.render(traces, shapes=shapes, annotations=annotations)
+
+@timed
+def chart_timeline_net_cum(df: pd.DataFrame, payback_month: Optional[int], render: str = "auto") -> go.Figure:
+    x = df["Month"].to_numpy(); net = df["Net EUR/mo"].to_numpy(); cum = df["Cum Net EUR"].to_numpy()
+    if _use_webgl(render, net.size + cum.size):  # bars have no WebGL trace: downsample them with the same LTTB rule
+        k = np.union1d(lttb_indices(x, net, POINT_BUDGET // 2), lttb_indices(x, cum, POINT_BUDGET // 2))  # shared months
+        traces = [dict(type="bar", x=x[k], y=net[k], name="Net EUR/mo", marker=dict(color=_net_colors(net[k])),
+                       hovertemplate="%{y:,.0f} EUR"),
+                  dict(type="scattergl", x=x[k], y=cum[k], mode="lines", name="Cumulative Net EUR",
+                       hovertemplate="%{y:,.0f} EUR")]
+    else:
+        traces = [dict(type="bar", x=x, y=net, name="Net EUR/mo", marker=dict(color=_net_colors(net)), hovertemplate="%{y:,.0f} EUR"),
+                  dict(type="scatter", x=x, y=cum, mode="lines+markers", name="Cumulative Net EUR", hovertemplate="%{y:,.0f} EUR")]
+    shapes, annotations = [], []
     if payback_month is not None:
-        fig.add_vline(x=payback_month, line_dash="dash", line_color="#444")
-        fig.add_annotation(x=payback_month, y=max(rev.max(), req.max())*0.95, xref="x", yref="y",
-                           text=f"Payback @ m{payback_month}", showarrow=False, font=dict(size=11, color="#444"))
+        shapes.append(_vline(payback_month, "#444", "dash"))
+        annotations.append(_note(payback_month, cum.max() * 0.9 if cum.max() > 0 else 0, f"Payback @ m{payback_month}", "#444"))
+    return TPL_NET_CUM.render(traces, shapes=shapes, annotations=annotations)
+
+@timed
+def chart_scenario_overlay(x: np.ndarray, Y: np.ndarray, title: str, yaxis_title: str,
+                           names: Optional[Sequence[str]] = None, render: str = "auto",
+                           max_named: int = 12) -> go.Figure:
+    """Overlay one line per scenario (rows of Y over months x).
+
+    Up to `max_named` rows get their own named trace. Beyond that all rows go into a single
+    trace with NaN breaks (one WebGL draw call instead of hundreds of traces). In WebGL mode
+    long horizons are LTTB-downsampled on the mean line.
+    """
+    x, Y = np.asarray(x, dtype=float), np.atleast_2d(np.asarray(Y, dtype=float))
+    gl = _use_webgl(render, Y.size)
+    if gl and Y.shape[1] > POINT_BUDGET:
+        keep = lttb_indices(x, Y.mean(axis=0), POINT_BUDGET)
+        x, Y = x[keep], Y[:, keep]
+    trace = go.Scattergl if gl else go.Scatter
+    fig = go.Figure()
+    if len(Y) <= max_named:
+        for i, row in enumerate(Y):
+            fig.add_trace(trace(x=x, y=row, mode="lines", name=names[i] if names else f"Scenario {i + 1}",
+                                hovertemplate="%{y:,.0f}"))
+    else:
+        xs = np.tile(np.append(x, np.nan), len(Y))
+        ys = np.hstack([Y, np.full((len(Y), 1), np.nan)]).ravel()
+        fig.add_trace(trace(x=xs, y=ys, mode="lines", name=f"{len(Y)} scenarios", connectgaps=False,
+                            line=dict(width=1, color="rgba(31,119,180,0.25)"), hoverinfo="skip"))
+        fig.add_trace(trace(x=x, y=np.median(Y, axis=0), mode="lines", name="Median",
+                            line=dict(width=2, color="#d62728"), hovertemplate="%{y:,.0f}"))
     fig.update_layout(
-        title="MRR vs Required over Time (with Steady-State)",
-        xaxis_title="Month", yaxis_title="EUR per month",
-        hovermode="x unified", template="plotly_white",
+        title=title, xaxis_title="Month", yaxis_title=yaxis_title,
+        hovermode="x unified" if len(Y) <= max_named else "closest", template="plotly_white",
         margin=dict(l=60, r=20, t=60, b=60),
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
     )
@@ -221,35 +1264,374 @@ def chart_timeline_finance(df: pd.DataFrame, ss_mrr: float, mrr_break_month: Opt
                        font=dict(size=12, color="#808080"))
     return fig
 
-def chart_timeline_net_cum(df: pd.DataFrame, payback_month: Optional[int]) -> go.Figure:
-    x = df["Month"]; net = df["Net EUR/mo"]; cum = df["Cum Net EUR"]
-    colors = ["rgba(33,150,83,0.45)" if v >= 0 else "rgba(244,67,54,0.45)" for v in net]
+@timed
+def chart_tornado(sens: pd.DataFrame) -> go.Figure:
+    """Tornado of NPV(Net) around the base model for low/high inputs (largest swing on top)."""
+    base = sens.attrs["base_npv"]
+    step = sens.attrs["rel_step"]
+    d = sens.iloc[::-1]
     fig = go.Figure()
-    fig.add_trace(go.Bar(x=x, y=net, name="Net EUR/mo", marker_color=colors, hovertemplate="%{y:,.0f} EUR"))
-    fig.add_trace(go.Scatter(x=x, y=cum, mode="lines+markers", name="Cumulative Net EUR", hovertemplate="%{y:,.0f} EUR"))
-    if payback_month is not None:
-        fig.add_vline(x=payback_month, line_dash="dash", line_color="#444")
-        fig.add_annotation(x=payback_month, y=cum.max()*0.9 if cum.max()>0 else 0, xref="x", yref="y",
-                           text=f"Payback @ m{payback_month}", showarrow=False, font=dict(size=11, color="#444"))
+    fig.add_trace(go.Bar(y=d["Field"], x=d["NPV low"] - base, base=base, orientation="h",
+                         name=f"Input −{step:.0%}", marker_color="rgba(244,67,54,0.6)",
+                         customdata=np.c_[d["Low"], d["NPV low"]],
+                         hovertemplate="%{customdata[0]:,.4g} → NPV %{customdata[1]:,.0f} EUR"))
+    fig.add_trace(go.Bar(y=d["Field"], x=d["NPV high"] - base, base=base, orientation="h",
+                         name=f"Input +{step:.0%}", marker_color="rgba(33,150,83,0.6)",
+                         customdata=np.c_[d["High"], d["NPV high"]],
+                         hovertemplate="%{customdata[0]:,.4g} → NPV %{customdata[1]:,.0f} EUR"))
+    fig.add_vline(x=base, line_dash="dot", line_color="#444")
     fig.update_layout(
-        title="Net & Cumulative Net over Time",
-        xaxis_title="Month", yaxis_title="EUR",
-        hovermode="x unified", template="plotly_white",
+        title="Sensitivity of NPV(Net) — one input at a time",
+        xaxis_title="NPV(Net) EUR", barmode="overlay", template="plotly_white",
         margin=dict(l=60, r=20, t=60, b=60),
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
-        barmode="overlay"
+        xaxis=dict(tickformat=",.0f"),
     )
     fig.add_annotation(x=0.5, y=-0.18, xref="paper", yref="paper", text=FOOTER, showarrow=False,
                        font=dict(size=12, color="#808080"))
     return fig
 
 
+# ------------------------------ Headless batch ----------------------------- #
+BATCH_CHUNK = 100_000
+SUMMARY_COLUMNS = ("payback_month", "mrr_break_month", "npv_net", "cum_net_end", "ss_mrr")
+
+def summarize_grid(p: dict, months: int) -> dict:
+    """Per-scenario summary metrics straight from the closed forms (no timelines); scheduled
+    scenarios take one timeline scan for all of them."""
+    if n_scenarios(p) == 0:
+        return {k: np.empty(0) for k in ("payback_month", "mrr_break_month", "npv_net", "cum_net_end", "ss_mrr")}
+    if p.get("schedules"):
+        return {**_scan_grid(p, months), "ss_mrr": steady_state_mrr_grid(p)}
+    T = np.full(n_scenarios(p), float(months))
+    return {"payback_month": solve_payback_month(p, months),
+            "mrr_break_month": solve_mrr_break_month(p, months),
+            "npv_net": npv_total_grid(p, months),
+            "cum_net_end": _revenue_fns(p, months)[1](T) - T * _required_grid(p),
+            "ss_mrr": steady_state_mrr_grid(p)}
+
+def _batch_eval(chunk: pd.DataFrame, start: int, months: int, mode: str, keep_inputs: bool,
+                dtype=np.float64) -> dict:
+    """Evaluate one chunk of scenario rows into {column: 1-D array}; runs in worker processes."""
+    p = scenario_params(**{c: chunk[c].to_numpy(dtype=float) for c in MODEL_FIELDS if c in chunk})
+    ids = np.arange(start, start + len(chunk))
+    if mode == "summary":
+        out = {"scenario": ids, **{k: v.astype(dtype, copy=False) for k, v in summarize_grid(p, months).items()}}
+        if keep_inputs:
+            out.update({c: chunk[c].to_numpy() for c in chunk.columns if c not in out})
+        return out
+    block = project_grid(p, months, dtype=dtype)
+    out = {"scenario": np.repeat(ids, months), "Month": np.tile(np.arange(1, months + 1), len(ids))}
+    out.update({c: block[c].ravel() for c in TIMELINE_COLUMNS})
+    return out
+
+def _iter_scenario_chunks(path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(sys.stdin if path == "-" else path, chunksize=chunk_size)
+
+class _ResultSink:
+    """Appends columnar result chunks to CSV (or stdout) or to a Parquet file, one chunk at a time."""
+
+    def __init__(self, path: str):
+        self.path, self._pq, self._fh = path, None, None
+
+    def write(self, cols: dict) -> None:
+        if self.path.endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.table(cols)  # straight from the arrays, no DataFrame in between
+            if self._pq is None:
+                self._pq = pq.ParquetWriter(self.path, table.schema)
+            self._pq.write_table(table)
+        else:
+            first = self._fh is None
+            if first:
+                self._fh = sys.stdout if self.path == "-" else open(self.path, "w", newline="")
+            pd.DataFrame(cols).to_csv(self._fh, header=first, index=False)
+
+    def close(self) -> None:
+        if self._pq is not None:
+            self._pq.close()
+        if self._fh is not None and self._fh is not sys.stdout:
+            self._fh.close()
+
+def run_batch(inp: str, out: str, months: int, mode: str = "summary", chunk_size: int = BATCH_CHUNK,
+              workers: int = 1, keep_inputs: bool = False, dtype=np.float64) -> int:
+    """Stream scenario rows from `inp` to `out` chunk by chunk; returns the number of scenarios.
+
+    With workers > 1 chunks are evaluated on a process pool with at most 2 × workers chunks in
+    flight, and results are written in input order. `dtype=np.float32` halves result size.
+    """
+    sink = _ResultSink(out)
+    from concurrent.futures import ProcessPoolExecutor
+    ex = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    pending: deque = deque()
+    done, t0 = 0, time.perf_counter()
+
+    def drain(limit: int) -> None:
+        nonlocal done
+        while len(pending) > limit:
+            res = pending.popleft()
+            res = res.result() if ex else res
+            sink.write(res)
+            done += len(res["scenario"]) // (months if mode == "timeline" else 1)
+            print(f"[batch] {done:,} scenarios  ({done / max(time.perf_counter() - t0, 1e-9):,.0f}/s)",
+                  file=sys.stderr)
+
+    try:
+        start = 0
+        for chunk in _iter_scenario_chunks(inp, chunk_size):
+            if not any(c in chunk for c in MODEL_FIELDS):
+                raise ValueError(f"No Model field columns in input; expected some of: {', '.join(MODEL_FIELDS)}")
+            args = (chunk, start, months, mode, keep_inputs, dtype)
+            pending.append(ex.submit(_batch_eval, *args) if ex else _batch_eval(*args))
+            start += len(chunk)
+            drain(2 * workers - 1 if ex else 0)
+        drain(0)
+    finally:
+        if ex:
+            ex.shutdown(cancel_futures=True)
+        sink.close()
+    return done
+
+def run_batch_cli(argv: Sequence[str]) -> int:
+    ap = argparse.ArgumentParser(prog="pynn.py batch", description="Evaluate scenario rows without Streamlit.")
+    ap.add_argument("input", help="CSV or .parquet with Model field columns (missing fields use defaults); '-' = stdin CSV")
+    ap.add_argument("-o", "--output", default="-", help="Output .csv or .parquet; '-' = stdout CSV (default)")
+    ap.add_argument("--months", type=int, default=36, help="Projection horizon (default 36)")
+    ap.add_argument("--mode", choices=("summary", "timeline"), default="summary",
+                    help="summary = one row per scenario; timeline = one row per scenario and month")
+    ap.add_argument("--chunk-size", type=int, default=BATCH_CHUNK, help=f"Rows per chunk (default {BATCH_CHUNK:,})")
+    ap.add_argument("--workers", type=int, default=1, help="Worker processes (default 1)")
+    ap.add_argument("--keep-inputs", action="store_true", help="Repeat input columns in summary output")
+    ap.add_argument("--float32", action="store_true", help="Write result values as float32 (half the size)")
+    a = ap.parse_args(argv)
+    n = run_batch(a.input, a.output, a.months, a.mode, a.chunk_size, a.workers, a.keep_inputs,
+                  np.float32 if a.float32 else np.float64)
+    print(f"[batch] done: {n:,} scenarios → {a.output}", file=sys.stderr)
+    return 0
+
+
+# ------------------------------ Scenario store ----------------------------- #
+SCENARIO_DB = os.environ.get("PYNN_SCENARIO_DB",
+                             os.path.join(os.path.dirname(os.path.abspath(__file__)), "pynn_scenarios.sqlite"))
+
+class ScenarioStore:
+    """Local SQLite store for saved scenarios: inputs, horizon, summary metrics and timelines.
+
+    `scenarios` has one row per saved run with every Model field as its own column (extra segments
+    and schedules as JSON lists) plus the SUMMARY_COLUMNS metrics, indexed by tag, created_at and payback month.
+    `timelines` holds each projection column as a float64 blob, so stored runs load without recomputation.
+    """
+
+    def __init__(self, path: str = SCENARIO_DB):
+        self.path = path
+        with self._connect() as con:
+            con.executescript(f"""
+                CREATE TABLE IF NOT EXISTS scenarios (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    tag TEXT NOT NULL DEFAULT '', name TEXT NOT NULL DEFAULT '',
+                    created_at TEXT NOT NULL, months INTEGER NOT NULL,
+                    {", ".join(f"{f} REAL" for f in MODEL_FIELDS)},
+                    extra_segments TEXT NOT NULL DEFAULT '[]', schedules TEXT NOT NULL DEFAULT '[]',
+                    {", ".join(f"{c} REAL" for c in SUMMARY_COLUMNS)});
+                CREATE INDEX IF NOT EXISTS ix_scenarios_tag ON scenarios(tag, created_at);
+                CREATE INDEX IF NOT EXISTS ix_scenarios_created ON scenarios(created_at);
+                CREATE INDEX IF NOT EXISTS ix_scenarios_payback ON scenarios(payback_month);
+                CREATE TABLE IF NOT EXISTS timelines (
+                    scenario_id INTEGER NOT NULL REFERENCES scenarios(id) ON DELETE CASCADE,
+                    col TEXT NOT NULL, data BLOB NOT NULL,
+                    PRIMARY KEY (scenario_id, col));
+            """)
+            have = {r[1] for r in con.execute("PRAGMA table_info(scenarios)")}
+            for col in ("extra_segments", "schedules"):  # databases created before these fields existed
+                if col not in have:
+                    con.execute(f"ALTER TABLE scenarios ADD COLUMN {col} TEXT NOT NULL DEFAULT '[]'")
+
+    def _connect(self) -> sqlite3.Connection:
+        con = sqlite3.connect(self.path, timeout=30)
+        con.execute("PRAGMA foreign_keys = ON")
+        return con
+
+    @timed
+    def save(self, m: Model, months: int, tag: str = "", name: str = "", timeline=None) -> int:
+        """Store `m` with its summary metrics and timeline (computed if not given); returns the id."""
+        if timeline is None:
+            timeline = project_timeline(m, months)
+        summary = {k: float(v[0]) for k, v in summarize_grid(scenario_params([m]), months).items()}
+        row = {"tag": tag, "name": name, "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "months": months,
+               **{f: float(getattr(m, f)) for f in MODEL_FIELDS},
+               "extra_segments": json.dumps([astuple(s) for s in m.extra_segments]),
+               "schedules": json.dumps([[f, astuple(sc)] for f, sc in m.schedules]),
+               **{k: (None if np.isnan(v) else v) for k, v in summary.items()}}
+        with self._connect() as con:
+            cur = con.execute(f"INSERT INTO scenarios ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                              list(row.values()))
+            sid = cur.lastrowid
+            con.executemany("INSERT INTO timelines (scenario_id, col, data) VALUES (?, ?, ?)",
+                            [(sid, c, np.ascontiguousarray(timeline[c], dtype=np.float64).tobytes())
+                             for c in (*TIMELINE_COLUMNS, *map(segment_column, m.extra_segments))])
+        return sid
+
+    @timed
+    def query(self, tag: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+              max_payback: Optional[float] = None, min_npv: Optional[float] = None,
+              limit: Optional[int] = None) -> pd.DataFrame:
+        """Saved scenarios (newest first) matching all given filters; dates are ISO strings.
+
+        A date-only `until` ("2026-10-18") includes that whole day.
+        """
+        until_cond = "created_at <= ?"
+        if until is not None and len(until) == 10:
+            until_cond = "created_at < ?"
+            until = (datetime.date.fromisoformat(until) + datetime.timedelta(days=1)).isoformat()
+        where, args = [], []
+        for cond, val in (("tag = ?", tag), ("created_at >= ?", since), (until_cond, until),
+                          ("payback_month <= ?", max_payback), ("npv_net >= ?", min_npv)):
+            if val is not None:
+                where.append(cond)
+                args.append(val)
+        sql = "SELECT * FROM scenarios" + (f" WHERE {' AND '.join(where)}" if where else "")
+        sql += " ORDER BY created_at DESC, id DESC" + (f" LIMIT {int(limit)}" if limit else "")
+        with self._connect() as con:
+            return pd.read_sql_query(sql, con, params=args)
+
+    def tags(self) -> list[str]:
+        with self._connect() as con:
+            return [r[0] for r in con.execute("SELECT DISTINCT tag FROM scenarios ORDER BY tag")]
+
+    def load_timelines(self, ids: Sequence[int], columns: Sequence[str] = TIMELINE_COLUMNS) -> dict:
+        """{id: {column: array}} for stored scenarios, read straight from the blobs."""
+        ids = [int(i) for i in ids]
+        if not ids:
+            return {}
+        out = {i: {} for i in ids}
+        q = (f"SELECT scenario_id, col, data FROM timelines WHERE scenario_id IN ({', '.join('?' * len(ids))})"
+             f" AND col IN ({', '.join('?' * len(columns))})")
+        with self._connect() as con:
+            for sid, col, data in con.execute(q, [*ids, *columns]):
+                out[sid][col] = np.frombuffer(data, dtype=np.float64)
+        return out
+
+    def model(self, sid: int) -> Model:
+        with self._connect() as con:
+            con.row_factory = sqlite3.Row
+            row = con.execute("SELECT * FROM scenarios WHERE id = ?", (int(sid),)).fetchone()
+        if row is None:
+            raise KeyError(f"No stored scenario with id {sid}")
+        return Model(**{f: (int(row[f]) if f in _INT_FIELDS else float(row[f])) for f in MODEL_FIELDS},
+                     extra_segments=tuple(Segment(*s) for s in json.loads(row["extra_segments"])),
+                     schedules=tuple((f, Schedule(tuple(map(tuple, steps)), growth, tuple(seasonal), tuple(series)))
+                                     for f, (steps, growth, seasonal, series) in json.loads(row["schedules"])))
+
+    def delete(self, sid: int) -> None:
+        with self._connect() as con:
+            con.execute("DELETE FROM scenarios WHERE id = ?", (int(sid),))
+
+
 # ------------------------------- Streamlit UI ------------------------------ #
+TABLE_PAGE_SIZE = 120  # rows per page; larger tables get a page selector
+
+@timed
+def show_table(st, df: pd.DataFrame, key: str, int_columns: Sequence[str] = (),
+               page_size: int = TABLE_PAGE_SIZE) -> None:
+    """st.dataframe that keeps numeric dtypes: `int_columns` are rounded (vectorized) and shown
+    with thousands separators via column formats; only the selected page is sent to the browser."""
+    view = df
+    if len(df) > page_size:
+        pages = -(-len(df) // page_size)
+        page = st.number_input(f"Page (of {pages}, {page_size} rows each)", min_value=1, max_value=pages,
+                               value=1, step=1, key=f"{key}_page")
+        view = df.iloc[(int(page) - 1) * page_size:int(page) * page_size]
+    cols = [c for c in int_columns if c in df.columns]
+    st.dataframe(view.round({c: 0 for c in cols}), hide_index=True, width="stretch",
+                 column_config={c: st.column_config.NumberColumn(c, format="%,d") for c in cols})
+
+@timed
+def pooled(st, pool: JobPool, slot: str, key: Hashable, fn: Callable, chunks: Sequence[tuple],
+           combine: Optional[Callable[[list], object]] = None, label: str = "Computing…"):
+    """Result of a JobPool job for this session, with a progress bar while it runs.
+
+    The session tracks one job per `slot`. A different key in the slot (inputs changed) releases
+    the previous job first; slots not asked for in a rerun are released by `release_stale_jobs`.
+    A rerun interrupting the wait leaves the job running, and the next rerun picks it up again.
+    """
+    owner = st.session_state.setdefault("pool_owner", os.urandom(8).hex())
+    jobs: dict = st.session_state.setdefault("jobs", {})
+    st.session_state.setdefault("jobs_wanted", set()).add(slot)
+    prev = jobs.get(slot)
+    if prev is not None and prev.key != key:
+        pool.release(prev, owner)
+    job = jobs[slot] = pool.submit(key, owner, fn, chunks, combine)
+    if not job.wait(0.05):
+        bar = st.progress(0.0, text=label)
+        while not job.wait(0.1):
+            bar.progress(job.progress, text=f"{label} {job.progress:.0%}")
+        bar.empty()
+    try:
+        return job.result()
+    finally:
+        del jobs[slot]
+        pool.release(job, owner)
+
+def release_stale_jobs(st, pool: JobPool) -> None:
+    """Release this session's jobs whose slot the current rerun did not ask for (e.g. the user
+    changed an input instead of waiting), cancelling them unless another session shares them."""
+    jobs: dict = st.session_state.get("jobs", {})
+    wanted = st.session_state.get("jobs_wanted", set())
+    for slot in [s for s in jobs if s not in wanted]:
+        pool.release(jobs.pop(slot), st.session_state.pool_owner)
+
+PLOTLY_CONFIG = {"displaylogo": False, "responsive": True}
+
+def show_chart(st, fig: go.Figure, name: str) -> None:
+    """st.plotly_chart with the app's config; when timing, records the serialized figure size."""
+    timer = active_timer()
+    if timer is None:
+        st.plotly_chart(fig, config=PLOTLY_CONFIG)
+        return
+    with timer.stage(f"plotly_chart {name}", kind="render", bytes=len(fig.to_json())):
+        st.plotly_chart(fig, config=PLOTLY_CONFIG)
+
+def show_timing_panel(st, timer: StageTimer, record: dict) -> None:
+    """Debug panel for a timed rerun: per-stage breakdown, unified counters and trace downloads."""
+    history: deque = st.session_state.setdefault("timing_history", deque(maxlen=50))
+    history.append(record)
+    with st.expander(f"⏱ Timing — {timer.total * 1e3:,.1f} ms this rerun"):
+        bd = timer.breakdown()
+        st.dataframe(bd, hide_index=True, width="stretch",
+                     column_config={"Total ms": st.column_config.NumberColumn(format="%.2f"),
+                                    "Max ms": st.column_config.NumberColumn(format="%.2f"),
+                                    "Bytes": st.column_config.NumberColumn(format="%d"),
+                                    "Share": st.column_config.ProgressColumn(min_value=0.0, max_value=1.0)})
+        st.json({k: record[k] for k in ("cache", "pool", "incremental") if k in record}, expanded=False)
+        d1, d2 = st.columns(2)
+        d1.download_button(f"Chrome trace ({len(history)} reruns)", json.dumps(chrome_trace(list(history))),
+                           file_name="pynn-trace.json", mime="application/json")
+        d2.download_button("JSON lines", "\n".join(json.dumps(r, default=float) for r in history),
+                           file_name="pynn-timings.jsonl", mime="application/x-ndjson")
+        if TIMING_LOG:
+            st.caption(f"Also appended to {TIMING_LOG}.")
+
 def run_streamlit_app():
     import streamlit as st  # import only inside the runner
 
     st.set_page_config(page_title="Pynn — Retention Accumulation", page_icon="📈", layout="wide")
+    if not (TIMING or st.query_params.get("timing") == "1"):
+        _render_app(st)
+        return
+    with StageTimer("rerun") as timer:
+        stats = _render_app(st)
+    record = timer.record(session=st.session_state.setdefault("pool_owner", os.urandom(8).hex()), **stats)
+    append_timing_log(record)
+    show_timing_panel(st, timer, record)
 
+def _render_app(st) -> dict:
+    """The app itself; returns the cache, pool and incremental-build counters of this rerun."""
     if "m" not in st.session_state:
         st.session_state.m = Model()
     m: Model = st.session_state.m
@@ -271,30 +1653,101 @@ def run_streamlit_app():
         m.retention_startup  = st.number_input("Startups retention r_s (0.000–0.999)",  min_value=0.0, max_value=0.999, value=float(m.retention_startup),  step=0.001, format="%.3f")
         m.retention_investor = st.number_input("Investors retention r_g (0.000–0.999)", min_value=0.0, max_value=0.999, value=float(m.retention_investor), step=0.001, format="%.3f")
 
+        st.header("Further segments")
+        if st.session_state.get("segments_of") is not m:  # new or loaded model → reset the editor
+            st.session_state.segments_of = m
+            st.session_state.segments_df = pd.DataFrame([astuple(sg) for sg in m.extra_segments],
+                                                        columns=[f.name for f in fields(Segment)]
+                                                        ).astype({"price_eur": float, "new_per_month": float, "retention": float})
+            st.session_state.pop("segments_editor", None)
+        seg_df = st.data_editor(
+            st.session_state.segments_df, key="segments_editor", num_rows="dynamic", hide_index=True,
+            column_config={"name": st.column_config.TextColumn("Segment", required=True),
+                           "price_eur": st.column_config.NumberColumn("Price (EUR / mo)", min_value=0.0, default=0.0),
+                           "new_per_month": st.column_config.NumberColumn("New / mo", min_value=0, default=0, step=1),
+                           "retention": st.column_config.NumberColumn("Retention", min_value=0.0, max_value=0.999,
+                                                                      default=0.9, step=0.001, format="%.3f")})
+        seg_df = seg_df.dropna(subset=["name"]).fillna({"price_eur": 0.0, "new_per_month": 0, "retention": 0.0})
+        seg_df = seg_df[~seg_df["name"].str.strip().isin(("", "S", "G"))].drop_duplicates("name")
+        m.extra_segments = tuple(Segment(str(r.name).strip(), float(r.price_eur), float(r.new_per_month), float(r.retention))
+                                 for r in seg_df.itertuples(index=False))
+
         st.header("Company finance")
         m.base_costs_eur      = st.number_input("Base costs (EUR / month)", min_value=0.0, value=float(m.base_costs_eur), step=100.0)
         m.marketing_costs_eur = st.number_input("Marketing (EUR / month)",  min_value=0.0, value=float(m.marketing_costs_eur), step=100.0)
         m.company_value_eur   = st.number_input("Company value (EUR)",      min_value=0.0, value=float(m.company_value_eur), step=10_000.0)
         m.discount_rate_pct   = st.slider("Discount rate (%)", min_value=0.0, max_value=100.0, value=float(m.discount_rate_pct), step=0.5)
 
+        st.header("Schedules (per month)")
+        sched = dict(m.schedules)
+        f_sel = st.selectbox("Scheduled input", SCHEDULE_FIELDS, help="The value set above is the base of the schedule.")
+        cur = sched.get(f_sel, Schedule())
+        growth = st.number_input(f"Growth % per year · {f_sel}", value=float(cur.growth_pct), step=0.5,
+                                 help="Compounded monthly, e.g. price indexation or cost inflation.")
+        steps_txt = st.text_input(f"Steps month:factor · {f_sel}", value=", ".join(f"{a}:{b:g}" for a, b in cur.steps),
+                                  help="Factor from that month on: 13:1.1 = +10% from month 13; 6:3, 9:1 = 3× in months 6–8.")
+        seasonal_txt = st.text_input(f"Seasonal multipliers · {f_sel}", value=", ".join(f"{v:g}" for v in cur.seasonal),
+                                     help="Repeat by month of the projection, e.g. 12 calendar-month factors.")
+        series = cur.series
+        up = st.file_uploader(f"Series CSV · {f_sel}", type=["csv"],
+                              help="One value per month (first numeric column), replacing the base; the last value repeats.")
+        if up is not None and st.session_state.get("series_file") != up.file_id:
+            st.session_state.series_file = up.file_id
+            series = tuple(pd.read_csv(up).select_dtypes("number").iloc[:, 0].dropna().astype(float))
+        if series and st.button(f"Clear series ({len(series)} months)"):
+            series = ()
+        try:
+            steps = tuple((int(a), float(b)) for a, b in (x.split(":") for x in steps_txt.replace(";", ",").split(",") if x.strip()))
+            seasonal = tuple(float(x) for x in seasonal_txt.replace(";", ",").split(",") if x.strip())
+        except ValueError:
+            st.warning("Could not parse steps / seasonal multipliers; keeping the previous schedule.")
+            steps, seasonal = cur.steps, cur.seasonal
+        sched[f_sel] = Schedule(steps, float(growth), seasonal, series)
+        m.schedules = tuple((f, sched[f]) for f in SCHEDULE_FIELDS if f in sched and sched[f] != Schedule())
+        if m.schedules:
+            st.caption("Scheduled: " + ", ".join(f for f, _ in m.schedules))
+
         st.header("Projection horizon")
         months = st.slider("Horizon (months)", min_value=1, max_value=120, value=36, step=1)
+        render = st.selectbox("Chart rendering", RENDER_MODES,
+                              help=f"auto = WebGL above {WEBGL_THRESHOLD:,} points per chart (series × months); "
+                                   f"LTTB downsampling above {POINT_BUDGET:,} points per series")
+        cache_stats_box = st.empty()
+
+    lap("sidebar inputs")
+
+    # ---------- Projection & steady-state (shared across sessions via the result cache) ----------
+    cache: ResultCache = st.cache_resource(_new_result_cache)()
+    pool: JobPool = st.cache_resource(_new_job_pool)()
+    st.session_state.jobs_wanted = set()  # filled by `pooled`, checked by `release_stale_jobs`
+    if "inc" not in st.session_state:
+        st.session_state.inc = IncrementalTimeline()
+    inc: IncrementalTimeline = st.session_state.inc
+    key = model_key(m)
+    built: dict = {}  # filled only when this rerun actually builds the timeline (result-cache miss)
+
+    def build_timeline():
+        out = inc.evaluate(m, months)
+        built.update(inc.stats()["last"])
+        return out
 
-    # ---------- Projection & steady-state ----------
-    df = project_timeline(m, months)
-    ss = steady_state_values(m)
+    df = cache.get_or_compute((key, months, "timeline"), build_timeline)
+    ss = cache.get_or_compute((key, "steady_state"), lambda: steady_state_values(m))
     req = monthly_required_eur(m)
 
     # Useful timing metrics
-    pbm = first_payback_month(df["Cum Net EUR"].to_numpy())
-    mrr_break_idx = np.where(df["Revenue EUR/mo"].to_numpy() >= df["Required EUR/mo"].to_numpy())[0]
-    mrr_break_month = int(mrr_break_idx[0] + 1) if mrr_break_idx.size else None
+    p1 = scenario_params([m])
+    pbm = month_or_none(solve_payback_month(p1, months)[0])
+    mrr_break_month = month_or_none(solve_mrr_break_month(p1, months)[0])
 
     t90_S = months_to_fraction_ss(m.retention_startup, 0.90)
     t90_G = months_to_fraction_ss(m.retention_investor, 0.90)
 
+    lap("projection & steady state")
+
     # ---------- Tabs ----------
-    tab_overview, tab_time = st.tabs(["Overview", "Timeline (Retention & Accumulation)"])
+    tab_overview, tab_time, tab_sens, tab_goal, tab_store = st.tabs(
+        ["Overview", "Timeline (Retention & Accumulation)", "Sensitivity", "Goal seek", "Saved scenarios"])
 
     # ===== Overview =====
     with tab_overview:
@@ -322,28 +1775,28 @@ def run_streamlit_app():
         st.caption("Required (EUR / month) = Base + Marketing + (DiscountRate × CompanyValue)/12.")
 
         # Chart
-        st.plotly_chart(
-            chart_overview_month(rev_m, req_m),
-            config={"displaylogo": False, "responsive": True}
-        )
+        show_chart(st, cache.get_or_compute(("fig_overview", rev_m, req_m), lambda: chart_overview_month(rev_m, req_m)),
+                   "overview")
 
         # Quick table
+        segs = model_segments(m)
+        act_m = np.array([float(row[segment_column(sg)]) for sg in segs])
+        price = segment_schedules(m, show_m)[0][:, -1]
         df_head = pd.DataFrame({
-            "Segment": ["Startups (S)", "Investors (G)", "Total"],
-            "Active (selected month)": [actS, actG, actS + actG],
-            "Price (EUR / month)": [m.price_startup_eur, m.price_investor_eur, np.nan],
-            "Revenue (EUR / month)": [actS*m.price_startup_eur, actG*m.price_investor_eur, rev_m],
+            "Segment": ["Startups (S)", "Investors (G)", *(sg.name for sg in m.extra_segments), "Total"],
+            "Active (selected month)": [*act_m, act_m.sum()],
+            "Price (EUR / month)": [*price, np.nan],
+            "Revenue (EUR / month)": [*(act_m * price), rev_m],
         })
-        df_disp = df_head.copy()
-        df_disp["Price (EUR / month)"]   = df_head["Price (EUR / month)"].apply(lambda x: "" if pd.isna(x) else f"{x:,.0f}")
-        df_disp["Revenue (EUR / month)"] = df_head["Revenue (EUR / month)"].apply(lambda x: f"{x:,.0f}")
-        df_disp["Active (selected month)"] = df_head["Active (selected month)"].apply(lambda x: f"{x:,.0f}")
-        st.dataframe(df_disp, hide_index=True, width="stretch")
+        show_table(st, df_head, key="overview",
+                   int_columns=["Active (selected month)", "Price (EUR / month)", "Revenue (EUR / month)"])
+
+    lap("tab: overview")
 
     # ===== Timeline =====
     with tab_time:
         st.subheader("Time-based Projection (Monthly)")
-        st.caption("Stacked actives (S+G), MRR vs Required (with SS MRR), and Net/Cumulative Net. "
+        st.caption("Stacked actives per segment, MRR vs Required (with SS MRR), and Net/Cumulative Net. "
                    "Also shows when you reach 90% of steady-state and when Revenue ≥ Required / Payback.")
 
         # Summary for horizon
@@ -365,34 +1818,163 @@ def run_streamlit_app():
         c18.metric("Payback month", f"{pbm if pbm is not None else 'not reached'}")
 
         # Charts
-        st.plotly_chart(
-            chart_timeline_actives_stacked(df, ss_S=ss["ss_act_S"], ss_G=ss["ss_act_G"]),
-            config={"displaylogo": False, "responsive": True}
-        )
-        st.plotly_chart(
-            chart_timeline_finance(df, ss_mrr=ss["ss_mrr"], mrr_break_month=mrr_break_month, payback_month=pbm),
-            config={"displaylogo": False, "responsive": True}
-        )
-        st.plotly_chart(
-            chart_timeline_net_cum(df, payback_month=pbm),
-            config={"displaylogo": False, "responsive": True}
-        )
+        show_chart(st, cache.get_or_compute((key, months, "fig_actives", render),
+                                            lambda: chart_timeline_actives_stacked(
+                                                df, ss_S=ss["ss_act_S"], ss_G=ss["ss_act_G"], render=render,
+                                                ss_extra={sg.name: ss[f"ss_act_{sg.name}"] for sg in m.extra_segments})),
+                   "actives")
+        show_chart(st, cache.get_or_compute((key, months, "fig_finance", render),
+                                            lambda: chart_timeline_finance(df, ss_mrr=ss["ss_mrr"], mrr_break_month=mrr_break_month, payback_month=pbm, render=render)),
+                   "finance")
+        show_chart(st, cache.get_or_compute((key, months, "fig_net_cum", render),
+                                            lambda: chart_timeline_net_cum(df, payback_month=pbm, render=render)),
+                   "net_cum")
+
+        with st.expander("Monte Carlo bands (stochastic churn & acquisition)"):
+            st.caption("Binomial churn and Poisson acquisitions per month; P10/P50/P90 at the horizon.")
+            mc1, mc2 = st.columns(2)
+            n_paths = mc1.number_input("Paths", min_value=1_000, max_value=1_000_000, value=20_000, step=1_000)
+            seed = mc2.number_input("Seed", min_value=0, value=0, step=1)
+            if st.button("Run Monte Carlo"):
+                mc_key = (key, months, "monte_carlo", int(n_paths), int(seed))
+                mc = cache.get_or_compute(mc_key, lambda: pooled(
+                    st, pool, "monte_carlo", mc_key, _mc_batch, mc_batches(m, months, int(n_paths), int(seed)),
+                    combine=lambda results: mc_combine(results, months, int(n_paths)), label="Simulating paths…"))
+                fmt_pb = lambda v: f"{v} mo" if v is not None else "not reached"
+                c21, c22, c23, c24 = st.columns(4)
+                c21.metric("Paths paying back", f"{mc['payback_share']:.1%}")
+                c22.metric("Payback P10 / P50 / P90",
+                           " / ".join(fmt_pb(mc[f"payback_p{q}"]) for q in (10, 50, 90)))
+                c23.metric(f"Cum Net P50 @ {months} mo", f"{mc['cum_net_p50']:,.0f} EUR",
+                           help=f"P10 {mc['cum_net_p10']:,.0f} · P90 {mc['cum_net_p90']:,.0f}")
+                c24.metric(f"NPV(Net) P50 @ {months} mo", f"{mc['npv_p50']:,.0f} EUR",
+                           help=f"P10 {mc['npv_p10']:,.0f} · P90 {mc['npv_p90']:,.0f}")
 
         with st.expander("Show projection table"):
-            df_show = df.copy()
-            for col in ["Active S","Active G","Revenue EUR/mo","Required EUR/mo","Net EUR/mo","Cum Net EUR","NPV(Net)"]:
-                df_show[col] = df_show[col].map(lambda x: f"{x:,.0f}")
-            st.dataframe(df_show, hide_index=True, width="stretch")
+            show_table(st, df, key="projection", int_columns=TIMELINE_COLUMNS)
+
+    lap("tab: timeline")
+
+    # ===== Sensitivity =====
+    with tab_sens:
+        st.subheader("Which input moves NPV the most?")
+        step_pct = st.slider("Perturbation (± % of each input)", min_value=1, max_value=50, value=10, step=1)
+        sens_key = (key, months, "sensitivity", step_pct)
+        sens = cache.get_or_compute(sens_key, lambda: sensitivity(m, months, step_pct / 100.0))
+        show_chart(st, cache.get_or_compute((key, months, "fig_tornado", step_pct), lambda: chart_tornado(sens)), "tornado")
+        st.caption("Elasticity = (% change in output) / (% change in input), central difference. "
+                   f"Base NPV(Net) @ {months} mo: {sens.attrs['base_npv']:,.0f} EUR.")
+        st.dataframe(sens, hide_index=True, width="stretch")
+
+    lap("tab: sensitivity")
+
+    # ===== Goal seek =====
+    with tab_goal:
+        st.subheader("Cheapest inputs that hit a target")
+        g1, g2, g3 = st.columns(3)
+        g_field = g1.selectbox("Solve for", MODEL_FIELDS, index=MODEL_FIELDS.index("price_investor_eur"))
+        g_sense = g2.radio("Find", ["min", "max"], horizontal=True,
+                           format_func=lambda v: "minimum" if v == "min" else "maximum")
+        g_hi = g3.number_input("Search up to", min_value=0.0, value=0.9999 if g_field in _RETENTION_FIELDS
+                               else max(10.0 * float(getattr(m, g_field)), 1.0))
+        g4, g5, g6 = st.columns(3)
+        use_pb = g4.checkbox("Payback by month", value=True)
+        pb_by = g4.number_input("Payback month", min_value=1, max_value=int(months), value=min(24, int(months)),
+                                disabled=not use_pb)
+        use_mrr = g5.checkbox("MRR ≥ Required by month")
+        mrr_by = g5.number_input("MRR-break month", min_value=1, max_value=int(months), value=min(12, int(months)),
+                                 disabled=not use_mrr)
+        use_npv = g6.checkbox(f"NPV(Net) @ {months} mo at least")
+        npv_min = g6.number_input("NPV floor (EUR)", value=0.0, step=10_000.0, disabled=not use_npv)
+        cons = {"payback_by": int(pb_by) if use_pb else None, "mrr_break_by": int(mrr_by) if use_mrr else None,
+                "min_npv": float(npv_min) if use_npv else None}
+        if not any(v is not None for v in cons.values()):
+            st.info("Pick at least one target.")
+        else:
+            goal_key = (key, months, "goal_seek", g_field, g_sense, float(g_hi), tuple(cons.items()))
+            x = cache.get_or_compute(goal_key, lambda: goal_seek(m, g_field, months, sense=g_sense,
+                                                                 hi=float(g_hi), **cons))
+            if x is None:
+                st.warning(f"No value of {g_field} in [0, {g_hi:,.4g}] meets the targets.")
+            else:
+                px = scenario_params([m], **{g_field: x})
+                r1, r2, r3 = st.columns(3)
+                r1.metric(f"{'Minimum' if g_sense == 'min' else 'Maximum'} {g_field}", f"{x:,.4g}",
+                          delta=f"{x - float(getattr(m, g_field)):+,.4g} vs current")
+                pb_x = month_or_none(solve_payback_month(px, months)[0])
+                r2.metric("Payback month at that value", f"{pb_x if pb_x is not None else 'not reached'}")
+                r3.metric(f"NPV(Net) @ {months} mo", f"{npv_total_grid(px, months)[0]:,.0f} EUR")
+
+    lap("tab: goal seek")
+
+    # ===== Saved scenarios =====
+    with tab_store:
+        store = ScenarioStore()
+        st.subheader("Save, query and compare runs")
+        s1, s2, s3 = st.columns([2, 2, 1])
+        save_tag = s1.text_input("Tag", value=time.strftime("%Y-%m"), help="e.g. the planning month")
+        save_name = s2.text_input("Name", value="")
+        s3.write("")
+        if s3.button("Save current"):
+            sid = store.save(m, months, tag=save_tag, name=save_name, timeline=df)
+            st.success(f"Saved scenario #{sid} ({months} months).")
+
+        q1, q2, q3 = st.columns(3)
+        q_tag = q1.selectbox("Tag filter", ["(all)"] + store.tags())
+        q_pb = q2.number_input("Payback by month (0 = any)", min_value=0, value=0, step=1)
+        q_npv = q3.number_input("Min NPV(Net) (EUR)", value=None, step=10_000.0)
+        found = store.query(tag=None if q_tag == "(all)" else q_tag, max_payback=q_pb or None, min_npv=q_npv)
+        show_table(st, found, key="store", int_columns=["npv_net", "cum_net_end", "ss_mrr"])
+
+        labels = dict(zip(found["id"], (f"#{i} {t} {n}".strip()
+                                        for i, t, n in zip(found["id"], found["tag"], found["name"]))))
+        picks = st.multiselect("Compare", found["id"].tolist(), format_func=labels.__getitem__,
+                               max_selections=200)
+        if picks:
+            cmp_col = st.selectbox("Series", TIMELINE_COLUMNS, index=TIMELINE_COLUMNS.index("Cum Net EUR"))
+            tl = store.load_timelines(picks, columns=[cmp_col])
+            T = max(len(v[cmp_col]) for v in tl.values())
+            Y = np.full((len(picks), T), np.nan)
+            for i, sid in enumerate(picks):
+                Y[i, :len(tl[sid][cmp_col])] = tl[sid][cmp_col]
+            show_chart(st, chart_scenario_overlay(np.arange(1, T + 1), Y, title=f"{cmp_col} — stored scenarios",
+                                                  yaxis_title=cmp_col, names=[f"#{i}" for i in picks], render=render),
+                       "overlay")
+            if len(picks) == 1 and st.button(f"Load #{picks[0]} into the sidebar"):
+                st.session_state.m = store.model(picks[0])
+                st.rerun()
+
+    lap("tab: saved scenarios")
+    release_stale_jobs(st, pool)
+
+    # Rendered last so the counters include this rerun
+    cs = cache.stats()
+    ps = pool.stats()
+    last = built or {"timeline": "result cache"}
+    build_line = (f"Timeline build — reused: {', '.join(k for k, v in last.items() if v == 'reused') or '—'}; "
+                  f"recomputed: {', '.join(k for k, v in last.items() if v == 'recomputed') or '—'}"
+                  if built else "Timeline served from result cache (no build this rerun)")
+    cache_stats_box.caption(f"Result cache: {cs['hits']} hits · {cs['misses']} misses · "
+                            f"{cs['size']}/{cs['maxsize']} entries · hit rate {cs['hit_rate']:.0%}  \n"
+                            f"Worker pool: {ps['workers']} workers · {ps['running']} running · {ps['submitted']} jobs · "
+                            f"{ps['deduplicated']} shared · {ps['cancelled']} cancelled  \n"
+                            f"{build_line}")
 
     # ---------- Footer ----------
     st.markdown(
         f"<div style='text-align:right;color:#808080;'>Made in Boden, Boanova</div>",
         unsafe_allow_html=True
     )
+    lap("footer")
+    return {"cache": cs, "pool": ps, "incremental": last}
 
 
 if __name__ == "__main__":
-    if _launched_by_streamlit():
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        sys.exit(run_batch_cli(sys.argv[2:]))
+    elif len(sys.argv) > 1 and sys.argv[1] == "--startup-profile":
+        sys.exit(startup_profile())
+    elif _launched_by_streamlit():
         run_streamlit_app()
     else:
         _bootstrap_streamlit()
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Pynn — benchmark suite for the calculation and charting hot paths.
+
+Fixed seeds and sizes, so runs are comparable across commits and machines of the same kind.
+Each case records median/min wall time per call, throughput and peak traced memory.
+
+Run:
+    python pynn_bench.py run -o bench.json            # full sizes
+    python pynn_bench.py run -o quick.json --quick    # ~10x smaller batches
+    python pynn_bench.py run -k grid -k chart         # only cases whose name contains a filter
+    python pynn_bench.py compare base.json bench.json --threshold 0.15
+
+`compare` exits with status 1 when any case is slower than base by more than the threshold.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os, sys, platform
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pynn  # noqa: E402
+
+SEED = 20240601
+MIN_TIME = 0.25   # seconds of repeated calls per case (after one warm-up call)
+MAX_REPS = 200
+
+
+# ---------------------------------- Cases ---------------------------------- #
+SCHEDULES = (("price_investor_eur", pynn.Schedule(steps=((13, 1.1), (25, 1.2)))),
+             ("S_new_per_month", pynn.Schedule(seasonal=(0.6, 0.8, 1.0, 1.2, 1.4, 1.2, 0.8, 0.6, 1.0, 1.2, 1.2, 1.0))),
+             ("base_costs_eur", pynn.Schedule(growth_pct=3.0)))
+
+def _grid_params(n: int, extra_segments: int = 0, schedules: tuple = ()) -> dict:
+    rng = np.random.default_rng(SEED)
+    base = pynn.Model(extra_segments=tuple(pynn.Segment(f"X{i}", 100.0 + 10 * i, 5, 0.95 - 0.01 * i)
+                                           for i in range(extra_segments)), schedules=schedules)
+    return pynn.scenario_params(
+        [base],
+        price_startup_eur=rng.uniform(5, 50, n), price_investor_eur=rng.uniform(20, 150, n),
+        S_new_per_month=rng.integers(0, 200, n), G_new_per_month=rng.integers(0, 200, n),
+        retention_startup=rng.uniform(0.7, 0.99, n), retention_investor=rng.uniform(0.7, 0.99, n),
+        marketing_costs_eur=rng.uniform(0, 20_000, n), discount_rate_pct=rng.uniform(0, 30, n))
+
+def build_cases(quick: bool = False) -> list[tuple[str, int, Callable[[], Callable[[], object]]]]:
+    """(name, items per call, setup) — setup returns the zero-arg callable that is timed."""
+    big = 10_000 if quick else 100_000
+    m = pynn.Model()
+
+    def timeline(T):
+        return lambda: (lambda: pynn.project_timeline(m, T))
+
+    def charts(builder):
+        def setup():
+            df = pynn.project_timeline(m, 120)
+            ss = pynn.steady_state_values(m)
+            pbm = pynn.first_payback_month(df["Cum Net EUR"].to_numpy())
+            args = {"overview": (float(df["Revenue EUR/mo"].iloc[-1]), float(df["Required EUR/mo"].iloc[-1])),
+                    "actives": (df, ss["ss_act_S"], ss["ss_act_G"]),
+                    "finance": (df, ss["ss_mrr"], 11, pbm),
+                    "net_cum": (df, pbm)}[builder]
+            fn = {"overview": pynn.chart_overview_month, "actives": pynn.chart_timeline_actives_stacked,
+                  "finance": pynn.chart_timeline_finance, "net_cum": pynn.chart_timeline_net_cum}[builder]
+            return lambda: fn(*args).to_json()
+        return setup
+
+    def grid(n, T, extra=0, schedules=()):
+        def setup():
+            p = _grid_params(n, extra, schedules)
+            return lambda: pynn.project_grid(p, T)
+        return setup
+
+    def solver(fn, n, T, extra=0):
+        def setup():
+            p = _grid_params(n, extra)
+            return lambda: fn(p, T)
+        return setup
+
+    def cohort(n, T):
+        def setup():
+            new = np.random.default_rng(SEED).poisson(50, (n, T)).astype(float)
+            return lambda: pynn.cohort_actives(new, [0.6, 0.75, 0.85, 0.95], T)
+        return setup
+
+    def payback_scan(T):
+        def setup():
+            cum = pynn.project_timeline(m, T)["Cum Net EUR"].to_numpy()
+            return lambda: pynn.first_payback_month(cum)
+        return setup
+
+    return [
+        ("actives_constant_new T=120", 120, lambda: (lambda: pynn.actives_constant_new(50, 0.92, 120))),
+        ("project_timeline T=36", 36, timeline(36)),
+        ("project_timeline T=120", 120, timeline(120)),
+        ("project_timeline T=1200", 1200, timeline(1200)),
+        ("steady_state_values", 1, lambda: (lambda: pynn.steady_state_values(m))),
+        ("first_payback_month T=120", 120, payback_scan(120)),
+        ("months_to_fraction_ss", 1, lambda: (lambda: pynn.months_to_fraction_ss(0.92, 0.9))),
+        (f"project_grid {big}x120", big * 120, grid(big, 120)),
+        (f"project_grid {big // 10}x1200", big // 10 * 1200, grid(big // 10, 1200)),
+        (f"project_grid {big}x120 +8 segments", big * 120, grid(big, 120, 8)),
+        (f"project_grid {big}x120 scheduled", big * 120, grid(big, 120, schedules=SCHEDULES)),
+        (f"solve_payback_month {big}x120", big, solver(pynn.solve_payback_month, big, 120)),
+        (f"solve_payback_month {big}x120 +8 segments", big, solver(pynn.solve_payback_month, big, 120, 8)),
+        (f"npv_total_grid {big}x120", big, solver(pynn.npv_total_grid, big, 120)),
+        (f"cohort_actives {big // 10}x600", big // 10 * 600, cohort(big // 10, 600)),
+        (f"monte_carlo {big // 5}x36", big // 5 * 36,
+         lambda: (lambda: pynn.monte_carlo(m, 36, n_paths=big // 5, seed=SEED))),
+        ("chart_overview_month", 1, charts("overview")),
+        ("chart_timeline_actives_stacked T=120", 120, charts("actives")),
+        ("chart_timeline_finance T=120", 120, charts("finance")),
+        ("chart_timeline_net_cum T=120", 120, charts("net_cum")),
+    ]
+
+
+# --------------------------------- Running --------------------------------- #
+def measure(fn: Callable[[], object]) -> dict:
+    fn()  # warm-up (lazy imports, caches)
+    times = []
+    t_end = time.perf_counter() + MIN_TIME
+    while len(times) < 3 or (time.perf_counter() < t_end and len(times) < MAX_REPS):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"median_s": statistics.median(times), "min_s": min(times), "reps": len(times), "peak_bytes": peak}
+
+def run(quick: bool, filters: Optional[list[str]] = None) -> dict:
+    results = {}
+    for name, items, setup in build_cases(quick):
+        if filters and not any(f in name for f in filters):
+            continue
+        r = measure(setup())
+        r["items"] = items
+        r["items_per_s"] = items / r["median_s"] if r["median_s"] > 0 else None
+        results[name] = r
+        print(f"  {name:<40} {r['median_s'] * 1e3:10.3f} ms  {r['peak_bytes'] / 2**20:8.1f} MiB peak",
+              file=sys.stderr)
+    versions = {}
+    for mod in ("numpy", "pandas", "plotly"):
+        try:
+            versions[mod] = __import__(mod).__version__
+        except ImportError:
+            versions[mod] = None
+    return {"meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "quick": quick, "seed": SEED,
+                     "python": platform.python_version(), "platform": platform.platform(),
+                     "cpus": os.cpu_count(), **versions},
+            "results": results}
+
+def compare(base: dict, new: dict, threshold: float) -> int:
+    """Print per-case ratios new/base (median time); return the number of slowdowns beyond threshold."""
+    slow = 0
+    print(f"{'case':<40} {'base ms':>10} {'new ms':>10} {'ratio':>7}")
+    for name, b in base["results"].items():
+        n = new["results"].get(name)
+        if n is None:
+            print(f"{name:<40} {b['median_s'] * 1e3:10.3f} {'—':>10} {'missing':>7}")
+            continue
+        ratio = n["median_s"] / b["median_s"] if b["median_s"] > 0 else float("inf")
+        flag = ""
+        if ratio > 1.0 + threshold:
+            flag, slow = "  SLOWER", slow + 1
+        elif ratio < 1.0 / (1.0 + threshold):
+            flag = "  faster"
+        print(f"{name:<40} {b['median_s'] * 1e3:10.3f} {n['median_s'] * 1e3:10.3f} {ratio:7.2f}{flag}")
+    if base["meta"].get("quick") != new["meta"].get("quick"):
+        print("[warn] comparing quick and full runs; sizes differ.", file=sys.stderr)
+    return slow
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Pynn benchmark suite")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("run", help="Run benchmarks and write JSON")
+    r.add_argument("-o", "--output", default="-", help="JSON output path ('-' = stdout)")
+    r.add_argument("--quick", action="store_true", help="Smaller batch sizes")
+    r.add_argument("-k", dest="filters", action="append", help="Only cases containing this text (repeatable)")
+    c = sub.add_parser("compare", help="Compare two JSON results")
+    c.add_argument("base")
+    c.add_argument("new")
+    c.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown fraction (default 0.15)")
+    a = ap.parse_args(argv)
+
+    if a.cmd == "run":
+        res = json.dumps(run(a.quick, a.filters), indent=2)
+        if a.output == "-":
+            print(res)
+        else:
+            with open(a.output, "w") as f:
+                f.write(res + "\n")
+        return 0
+    with open(a.base) as fb, open(a.new) as fn:
+        slow = compare(json.load(fb), json.load(fn), a.threshold)
+    print(f"\n{slow} case(s) slower than base by more than {a.threshold:.0%}.")
+    return 1 if slow else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Pynn — Model inputs and the Monte Carlo batch kernel.
+
+Kept apart from pynn.py because Streamlit re-executes that script as a fresh `__main__` on every
+rerun: classes and functions defined here are imported once, so Models and `_mc_batch` pickle by
+reference for the worker pool (see `pynn.JobPool`). pynn re-exports everything; import from there.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+# --------------------------------- Model --------------------------------- #
+@dataclass(frozen=True)
+class Segment:
+    """A customer segment: monthly price, new customers per month and monthly retention."""
+    name: str
+    price_eur: float
+    new_per_month: float
+    retention: float
+
+@dataclass(frozen=True)
+class Schedule:
+    """Per-month profile of a Model input: its base value (or an explicit `series`) times step,
+    growth and seasonal factors.
+
+    - steps: ((month, factor), ...), each factor holding from that month on, e.g. ((13, 1.1),) = +10%
+      from month 13, ((6, 3.0), (9, 1.0)) = a 3× burst in months 6–8
+    - growth_pct: compound annual growth (inflation), (1 + g)^((t - 1) / 12) in month t
+    - seasonal: multipliers repeating by month of the projection (12 values = calendar seasonality)
+    - series: explicit values per month (e.g. an uploaded plan) replacing the base; the last repeats
+    """
+    steps: tuple[tuple[int, float], ...] = ()
+    growth_pct: float = 0.0
+    seasonal: tuple[float, ...] = ()
+    series: tuple[float, ...] = ()
+
+    def values(self, base, months: int) -> np.ndarray:
+        """Scheduled values for months 1..T: (T,) for a scalar base, (n, T) for an (n,) array."""
+        t = np.arange(1, max(months, 0) + 1)
+        f = (1.0 + self.growth_pct / 100.0) ** ((t - 1) / 12.0)
+        if self.steps:
+            at, factor = np.array(sorted(self.steps), dtype=float).T
+            k = np.searchsorted(at, t, side="right") - 1
+            f = f * np.where(k >= 0, factor[np.maximum(k, 0)], 1.0)
+        if self.seasonal:
+            f = f * np.asarray(self.seasonal, dtype=float)[(t - 1) % len(self.seasonal)]
+        base = np.asarray(base, dtype=float)[..., None]
+        if self.series:
+            series = np.asarray(self.series, dtype=float)
+            return np.broadcast_to(series[np.minimum(t - 1, len(series) - 1)] * f, base.shape[:-1] + t.shape)
+        return base * f
+
+@dataclass
+class Model:
+    # Pricing (EUR per month)
+    price_startup_eur: float = 19.0
+    price_investor_eur: float = 79.0
+
+    # NEW customers per month (acquisitions)
+    S_new_per_month: int = 50
+    G_new_per_month: int = 50
+
+    # Company finance (EUR per month except value)
+    base_costs_eur: float = 10_000.0
+    marketing_costs_eur: float = 5_000.0
+    company_value_eur: float = 2_500_000.0  # absolute EUR
+    discount_rate_pct: float = 10.0         # annual percent
+
+    # Retention (monthly stay probability)
+    retention_startup: float = 0.92
+    retention_investor: float = 0.92
+
+    # Further segments (accelerators, funds, corporates, …) beyond S and G; a tuple keeps Model hashable
+    extra_segments: tuple[Segment, ...] = ()
+
+    # Per-month schedules: ((field, Schedule), ...) for fields in SCHEDULE_FIELDS
+    schedules: tuple[tuple[str, Schedule], ...] = ()
+
+
+SCHEDULE_FIELDS = ("price_startup_eur", "price_investor_eur", "S_new_per_month", "G_new_per_month",
+                   "base_costs_eur", "marketing_costs_eur")
+
+def scheduled(schedules, field: str, base, months: int) -> np.ndarray:
+    """`base` (scalar or (n,) array) per month under the Schedule for `field`, shape (..., T);
+    unscheduled fields are broadcast (no copy)."""
+    sch = dict(schedules)
+    bad = sorted(set(sch) - set(SCHEDULE_FIELDS))
+    if bad:
+        raise ValueError(f"Fields cannot be scheduled: {', '.join(bad)}")
+    if field in sch:
+        return sch[field].values(base, months)
+    base = np.asarray(base, dtype=float)
+    return np.broadcast_to(base[..., None], base.shape + (max(months, 0),))
+
+
+def model_segments(m: Model) -> tuple[Segment, ...]:
+    """All segments of a Model: S, G, then `extra_segments`."""
+    return (Segment("S", m.price_startup_eur, m.S_new_per_month, m.retention_startup),
+            Segment("G", m.price_investor_eur, m.G_new_per_month, m.retention_investor),
+            *m.extra_segments)
+
+def segment_vectors(m: Model) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(price, new per month, retention) as (K,) arrays over `model_segments(m)`."""
+    v = np.array([(s.price_eur, s.new_per_month, s.retention) for s in model_segments(m)], dtype=float)
+    return v[:, 0], v[:, 1], v[:, 2]
+
+
+# ------------------------------- Calculations ------------------------------ #
+_SG_FIELDS = (("price_startup_eur", "S_new_per_month"), ("price_investor_eur", "G_new_per_month"))
+
+def required_by_month(m: Model, months: int) -> np.ndarray:
+    """Required EUR per month (base + marketing + capital cost of the company value) with scheduled
+    base and marketing costs, shape (T,)."""
+    return (scheduled(m.schedules, "base_costs_eur", m.base_costs_eur, months)
+            + scheduled(m.schedules, "marketing_costs_eur", m.marketing_costs_eur, months)
+            + (m.discount_rate_pct / 100.0 * m.company_value_eur) / 12.0)
+
+def segment_schedules(m: Model, months: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(price, new per month) as (K × T) arrays under the Model's schedules, and retention (K,)."""
+    price, new, r = segment_vectors(m)
+    price_t, new_t = (np.repeat(v[:, None], max(months, 0), axis=1) for v in (price, new))
+    for k, (f_price, f_new) in enumerate(_SG_FIELDS):
+        price_t[k] = scheduled(m.schedules, f_price, price[k], months)
+        new_t[k] = scheduled(m.schedules, f_new, new[k], months)
+    return price_t, new_t, r
+
+
+# ------------------------------- Monte Carlo ------------------------------- #
+MC_BATCH = 65_536  # paths per batch; state is a few int/float vectors of this length
+
+def _mc_batch(m: Model, months: int, n_paths: int, seed: np.random.SeedSequence) -> dict:
+    """Simulate `n_paths` paths month by month: binomial churn + Poisson acquisitions per segment.
+
+    Only per-path running state is kept (actives, cum net, NPV, payback month), never (paths × months).
+    """
+    rng = np.random.default_rng(seed)
+    price, new, r = segment_schedules(m, months)
+    price, new, r = price.T.copy(), new.T.copy(), np.clip(r, 0.0, 0.9999)  # (T × K): one row per month
+    req = required_by_month(m, months)
+    d = (m.discount_rate_pct / 100.0) / 12.0
+
+    act = np.zeros((n_paths, len(r)), dtype=np.int64)
+    cum = np.zeros(n_paths)
+    npv = np.zeros(n_paths)
+    payback = np.zeros(n_paths, dtype=np.int64)  # 0 = not reached
+    cum_sum = np.zeros(months)
+    cum_sumsq = np.zeros(months)
+    for t in range(1, months + 1):
+        act = rng.binomial(act, r) + rng.poisson(new[t - 1], act.shape)
+        net = act @ price[t - 1] - req[t - 1]
+        cum += net
+        npv += net / (1.0 + d) ** t
+        payback[(payback == 0) & (cum >= 0)] = t
+        cum_sum[t - 1] = cum.sum()
+        cum_sumsq[t - 1] = np.square(cum).sum()
+    return {"payback_hist": np.bincount(payback, minlength=months + 1), "cum_net": cum, "npv": npv,
+            "cum_sum": cum_sum, "cum_sumsq": cum_sumsq}
+
+def _mc_batch_star(args: tuple) -> dict:
+    return _mc_batch(*args)
+
+def _hist_percentile(hist: np.ndarray, q: float) -> Optional[int]:
+    """Percentile of payback months from counts; bucket 0 (never paid back) sorts last → None."""
+    counts = np.append(hist[1:], hist[0])
+    k = int(np.searchsorted(np.cumsum(counts), q / 100.0 * counts.sum(), side="left"))
+    return k + 1 if k < len(hist) - 1 else None
+
+def mc_batches(m: Model, months: int, n_paths: int, seed: int = 0, batch_size: int = MC_BATCH) -> list[tuple]:
+    """`_mc_batch` argument tuples splitting `n_paths` into batches with independent child seeds."""
+    sizes = [min(batch_size, n_paths - lo) for lo in range(0, n_paths, batch_size)]
+    return [(m, months, k, ss) for k, ss in zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes)))]
+
+def mc_combine(results: Sequence[dict], months: int, n_paths: int,
+               quantiles: Sequence[float] = (10, 50, 90)) -> dict:
+    """Merge `_mc_batch` results into the `monte_carlo` summary."""
+    hist = np.zeros(months + 1, dtype=np.int64)
+    cum_sum, cum_sumsq = np.zeros(months), np.zeros(months)
+    for res in results:
+        hist += res["payback_hist"]
+        cum_sum += res["cum_sum"]
+        cum_sumsq += res["cum_sumsq"]
+    cum_end = np.concatenate([res["cum_net"] for res in results])
+    npv = np.concatenate([res["npv"] for res in results])
+    mean = cum_sum / n_paths
+    out = {"paths": n_paths, "payback_share": float(1.0 - hist[0] / n_paths),
+           "cum_net_mean": mean, "cum_net_std": np.sqrt(np.maximum(cum_sumsq / n_paths - mean ** 2, 0.0))}
+    for q in quantiles:
+        out[f"payback_p{q:g}"] = _hist_percentile(hist, q)
+        out[f"cum_net_p{q:g}"] = float(np.percentile(cum_end, q))
+        out[f"npv_p{q:g}"] = float(np.percentile(npv, q))
+    return out
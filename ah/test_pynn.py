@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""Equivalence checks: closed-form / batched paths against `project_timeline`.  Run: pytest ah"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pynn  # noqa: E402
+
+
+@pytest.mark.parametrize("rate", [0.0, 1e-12, 1e-9, 1e-6, 1e-5, 5e-5, 1e-4, 0.01, 10.0])
+def test_npv_total_grid_small_discount_rates(rate):
+    m = pynn.Model(discount_rate_pct=rate)
+    expected = pynn.project_timeline(m, 120)["NPV(Net)"].sum()
+    got = pynn.npv_total_grid(pynn.scenario_params([m]), 120)[0]
+    assert got == pytest.approx(expected, rel=1e-10)
+
+
+def _models(extra=(), schedules=()):
+    """A spread of Models sharing `extra` segments and `schedules` (as `scenario_params` requires)."""
+    rng = np.random.default_rng(7)
+    out = [pynn.Model(extra_segments=extra, schedules=schedules),
+           pynn.Model(retention_startup=0.0, retention_investor=0.999, extra_segments=extra, schedules=schedules),
+           pynn.Model(S_new_per_month=0, G_new_per_month=0, extra_segments=extra, schedules=schedules)]
+    for _ in range(20):
+        out.append(pynn.Model(price_startup_eur=rng.uniform(0, 60), price_investor_eur=rng.uniform(0, 200),
+                              S_new_per_month=int(rng.integers(0, 150)), G_new_per_month=int(rng.integers(0, 150)),
+                              base_costs_eur=rng.uniform(0, 30_000), marketing_costs_eur=rng.uniform(0, 10_000),
+                              company_value_eur=rng.uniform(0, 5e6), discount_rate_pct=rng.uniform(0, 40),
+                              retention_startup=rng.uniform(0.5, 0.999), retention_investor=rng.uniform(0.5, 0.999),
+                              extra_segments=extra, schedules=schedules))
+    return out
+
+CASES = {
+    "plain": {},
+    "extra segments": {"extra": (pynn.Segment("Funds", 400.0, 3.0, 0.95), pynn.Segment("Corp", 900.0, 1.0, 0.0))},
+    "schedules": {"schedules": (("price_startup_eur", pynn.Schedule(growth_pct=3.0)),
+                                 ("S_new_per_month", pynn.Schedule(steps=((6, 3.0), (9, 1.0)), seasonal=(1.0, 0.5))),
+                                 ("base_costs_eur", pynn.Schedule(steps=((13, 1.5),))))},
+}
+
+
+@pytest.fixture(params=list(CASES), ids=list(CASES))
+def models(request):
+    return _models(**CASES[request.param])
+
+
+@pytest.mark.parametrize("months", [1, 36, 240])
+def test_project_grid_matches_project_timeline(models, months):
+    grid = pynn.project_grid(pynn.scenario_params(models), months)
+    for i, m in enumerate(models):
+        tl = pynn.project_timeline(m, months)
+        for c in grid:
+            np.testing.assert_allclose(grid[c][i], tl[c].to_numpy(), rtol=1e-9, atol=1e-6, err_msg=c)
+
+
+def _first_month(ok):
+    idx = np.flatnonzero(ok)
+    return float(idx[0] + 1) if idx.size else np.nan
+
+
+@pytest.mark.parametrize("months", [1, 36, 240])
+def test_solvers_match_project_timeline(models, months):
+    p = pynn.scenario_params(models)
+    summary = pynn.summarize_grid(p, months)
+    np.testing.assert_array_equal(summary["payback_month"], pynn.solve_payback_month(p, months))
+    np.testing.assert_array_equal(summary["mrr_break_month"], pynn.solve_mrr_break_month(p, months))
+    np.testing.assert_allclose(summary["npv_net"], pynn.npv_total_grid(p, months), rtol=1e-12)
+    for i, m in enumerate(models):
+        tl = pynn.project_timeline(m, months)
+        assert np.array_equal(summary["payback_month"][i], _first_month(tl["Cum Net EUR"] >= 0), equal_nan=True)
+        assert np.array_equal(summary["mrr_break_month"][i], _first_month(tl["Net EUR/mo"] >= 0), equal_nan=True)
+        assert summary["npv_net"][i] == pytest.approx(tl["NPV(Net)"].sum(), rel=1e-9, abs=1e-4)
+        assert summary["cum_net_end"][i] == pytest.approx(tl["Cum Net EUR"].iloc[-1], rel=1e-9, abs=1e-4)
+
+
+MC_KEYS = ("payback_share", "payback_p10", "payback_p50", "payback_p90",
+           "cum_net_p10", "cum_net_p50", "cum_net_p90", "npv_p10", "npv_p50", "npv_p90")
+
+
+def _assert_same_mc(a, b):
+    assert {k: a[k] for k in MC_KEYS} == {k: b[k] for k in MC_KEYS}
+    np.testing.assert_array_equal(a["cum_net_mean"], b["cum_net_mean"])
+    np.testing.assert_array_equal(a["cum_net_std"], b["cum_net_std"])
+
+
+def test_monte_carlo_does_not_depend_on_workers():
+    m = pynn.Model(extra_segments=(pynn.Segment("Funds", 400.0, 3.0, 0.95),))
+    base = pynn.monte_carlo(m, 36, n_paths=5_000, seed=3, batch_size=1_000)
+    _assert_same_mc(base, pynn.monte_carlo(m, 36, n_paths=5_000, seed=3, batch_size=1_000, workers=3))
+    pool = pynn.JobPool(workers=2)
+    job = pool.submit("mc", "test", pynn._mc_batch, pynn.mc_batches(m, 36, 5_000, 3, 1_000),
+                      lambda results: pynn.mc_combine(results, 36, 5_000))
+    try:
+        _assert_same_mc(base, job.result())
+    finally:
+        pool.release(job, "test")
+        pool._ex.shutdown()
+
+
+def test_solvers_on_an_empty_grid():
+    p = {k: (v if k == "schedules" else v[:0]) for k, v in pynn.scenario_params([_models()[0]]).items()}
+    assert pynn.solve_mrr_break_month(p, 36).shape == pynn.solve_payback_month(p, 36).shape == (0,)
+    assert all(v.shape == (0,) for v in pynn.summarize_grid(p, 36).values())
+
+
+def test_shared_segments_with_equal_retention_are_merged():
+    extra = (pynn.Segment("A", 300.0, 2.0, 0.9), pynn.Segment("B", 700.0, 1.0, 0.9), pynn.Segment("C", 50.0, 9.0, 0.5))
+    models = _models(extra=extra)
+    p = pynn.scenario_params(models)
+    summary = pynn.summarize_grid(p, 10_000_000)  # O(log T): a long horizon stays cheap
+    tl = pynn.project_timeline(models[0], 240)
+    assert pynn.summarize_grid(p, 240)["cum_net_end"][0] == pytest.approx(tl["Cum Net EUR"].iloc[-1], rel=1e-9)
+    assert summary["payback_month"].shape == (len(models),)
+
+
+@pytest.mark.parametrize("chart", ["finance", "net_cum"])
+def test_webgl_timeline_traces_share_months(chart):
+    df = pynn.project_timeline(pynn.Model(S_new_per_month=5, retention_startup=0.99), 5_000)
+    fig = (pynn.chart_timeline_finance(df, 0.0, None, None, render="webgl") if chart == "finance"
+           else pynn.chart_timeline_net_cum(df, None, render="webgl"))
+    a, b = fig.data
+    assert np.array_equal(a.x, b.x) and len(a.x) <= pynn.POINT_BUDGET
+
+
+def test_auto_webgl_counts_points_per_figure():
+    df = pynn.project_timeline(pynn.Model(), 120)
+    assert pynn.chart_timeline_finance(df, 0.0, None, None).data[0].type == "scatter"
+    fig = pynn.chart_scenario_overlay(np.arange(1, 121), np.ones((10, 120)), "t", "y")  # 10 series × 120 months
+    assert fig.data[0].type == "scattergl"
+
+
+def test_incremental_timeline_reuses_actives_on_price_and_cost_schedule_edits():
+    inc = pynn.IncrementalTimeline()
+    m = pynn.Model(extra_segments=(pynn.Segment("Funds", 400.0, 3.0, 0.95),),
+                   schedules=(("S_new_per_month", pynn.Schedule(steps=((6, 2.0),))),))
+    inc.evaluate(m, 60)
+    edits = [("schedules", m.schedules + (("price_startup_eur", pynn.Schedule(growth_pct=5.0)),)),
+             ("extra_segments", (pynn.Segment("Funds", 900.0, 3.0, 0.95),)),
+             ("schedules", m.schedules + (("base_costs_eur", pynn.Schedule(steps=((13, 1.5),))),))]
+    for field, value in edits:
+        setattr(m, field, value)
+        df = inc.evaluate(m, 60)
+        assert inc.last["actives"] == "reused", field
+        assert df.equals(pynn.project_timeline(m, 60))
+    assert inc.last["required"] == "recomputed"
+    m.schedules = m.schedules + (("G_new_per_month", pynn.Schedule(seasonal=(1.0, 0.5))),)
+    inc.evaluate(m, 60)
+    assert inc.last["actives"] == "recomputed"
+
+
+def _meets(m, months, payback_by=None, mrr_break_by=None, min_npv=None):
+    """`goal_constraints_met` for one Model, from its `project_timeline`."""
+    tl = pynn.project_timeline(m, months)
+    ok = True
+    if payback_by is not None:
+        ok &= _first_month(tl["Cum Net EUR"] >= 0) <= payback_by  # NaN → False
+    if mrr_break_by is not None:
+        ok &= _first_month(tl["Net EUR/mo"] >= 0) <= mrr_break_by
+    if min_npv is not None:
+        ok &= tl["NPV(Net)"].sum() >= min_npv
+    return bool(ok)
+
+
+@pytest.mark.parametrize("field, sense, step, constraints", [
+    ("price_startup_eur", "min", -1.0, {"payback_by": 24}),
+    ("S_new_per_month", "min", -1, {"payback_by": 30, "mrr_break_by": 12}),
+    ("marketing_costs_eur", "max", 1.0, {"payback_by": 36}),
+    ("marketing_costs_eur", "max", 1.0, {"min_npv": 50_000.0}),
+])
+def test_goal_seek_boundary_matches_project_timeline(field, sense, step, constraints):
+    m = pynn.Model()
+    x = pynn.goal_seek(m, field, 48, sense=sense, **constraints)
+    assert x is not None
+    assert _meets(pynn.Model(**{field: x}), 48, **constraints)
+    assert not _meets(pynn.Model(**{field: x + step}), 48, **constraints)
+
+
+def test_goal_seek_clamps_payback_by_to_the_horizon():
+    far = pynn.goal_seek(pynn.Model(), "price_startup_eur", 24, payback_by=240)
+    assert far == pynn.goal_seek(pynn.Model(), "price_startup_eur", 24, payback_by=24)
+    assert _meets(pynn.Model(price_startup_eur=far), 24, payback_by=24)
+
+
+def test_goal_seek_returns_none_when_infeasible():
+    m = pynn.Model(S_new_per_month=0, G_new_per_month=0)  # no customers: no price ever pays back
+    assert pynn.goal_seek(m, "price_startup_eur", 36, payback_by=36) is None
+    assert pynn.goal_seek(pynn.Model(), "marketing_costs_eur", 36, sense="max", lo=1e9, hi=2e9, payback_by=36) is None
@@ -4,6 +4,10 @@
 Interaktiv text->video med OpenAI Sora 2.
 - Sparar MP4 i samma mapp som skriptet körs från (current working directory).
 - Först frågar om kontext, sedan om prompt, och kör direkt.
+- Jobbet loggas i sora-jobs.jsonl; avbrutna jobb hämtas med
+  `python ai_media_generator.py --resume`.
+- Samma prompt + parametrar igen hämtas direkt ur renderingscachen
+  (~/.cache/sora-renders); sätt SORA_NO_CACHE=1 för att rendera om.
 
 Snabbstart (PowerShell):
     pip install --upgrade openai
@@ -18,6 +22,9 @@ from typing import Optional
 
 from openai import OpenAI
 
+from sora_jobs import (JobJournal, JobPoller, PolledJob, RenderCache, cache_enabled, download_video,
+                       format_download)
+
 
 def expand_prompt(context: str, user_prompt: str) -> str:
     """
@@ -53,12 +60,22 @@ def generate_video(
     seconds: int = 8,
     size: str = "1280x720",
     model: str = "sora-2",
-    poll_interval: int = 6,
     max_wait_seconds: int = 10 * 60,
+    use_cache: bool = True,
 ) -> Optional[Path]:
     """
-    Skapar videouppgift, pollar tills klar och laddar ner MP4 till out_path.
+    Skapar videouppgift, pollar tills klar (via JobPoller) och laddar ner MP4 till out_path.
+    Finns samma prompt/parametrar i renderingscachen kopieras den i stället.
     """
+    cache = RenderCache()
+    params = dict(prompt=prompt, seconds=seconds, size=size, model=model)
+    if use_cache:
+        hit = cache.get(cache.key(**params), out_path)
+        if hit is not None:
+            print(f"\n[CACHE] Träff ({hit['bytes'] / 1e6:.1f} MB), ingen rendering behövs.")
+            print(f"[OK] Sparad: {out_path.resolve()}")
+            return out_path
+
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         print("[FEL] Miljövariabeln OPENAI_API_KEY saknas.")
@@ -90,75 +107,69 @@ def generate_video(
         print("[FEL] Inget job-id i svaret.")
         return None
 
+    journal = JobJournal()
+    journal.record(job_id, "submitted", **params, out_path=str(out_path.resolve()))
     print(f"   Jobb-ID: {job_id}")
 
-    # Poll-loop
+    # Pollning: adaptivt intervall efter progress, backoff med jitter vid fel
     start = time.time()
-    last_progress = -1
-    poll_count = 0
+    shown = {"progress": -1, "status": None}
     bar_len = 28
 
-    while True:
-        if time.time() - start > max_wait_seconds:
-            print("\n[TIMEOUT] Uppgiften överskred tidsgränsen.")
-            print(f"   Spara jobbid och försök senare: {job_id}")
-            return None
+    def on_update(j: PolledJob) -> None:
+        if j.progress != shown["progress"] or j.status != shown["status"]:
+            filled = int(bar_len * (j.progress / 100.0))
+            bar = "█" * filled + "░" * (bar_len - filled)
+            elapsed = int(time.time() - start)
+            print(f"   [{bar}] {j.progress:3d}%  ({j.status})  t={elapsed}s")
+            shown.update(progress=j.progress, status=j.status)
+
+    def on_error(j: PolledJob, e: BaseException) -> None:
+        print(f"[VARN] Poll-fel ({j.errors} st): {e}")
+
+    with JobPoller(client) as poller:
+        polled = poller.wait(poller.track(job_id, on_update, max_wait_seconds, on_error))
+    status_obj = polled.obj
+    m = polled.metrics()
+    lag = m["detect_lag_s"] if m["detect_lag_s"] is not None else m["detect_lag_max_s"]
+    lag_txt = f", upptäckt inom {lag:.1f}s" if lag is not None else ""
+    print(f"   Pollningar: {m['polls']} (fel: {m['errors']}){lag_txt}")
+
+    if polled.status == "timeout":
+        journal.record(job_id, "timeout")
+        print("\n[TIMEOUT] Uppgiften överskred tidsgränsen.")
+        print(f"   Hämta senare med: python ai_media_generator.py --resume ({job_id})")
+        return None
 
+    if polled.status == "completed":
+        journal.record(job_id, "completed")
+        print("\n[OK] Renderingen är klar. Hämtar video...")
         try:
-            status_obj = client.videos.retrieve(job_id)
+            # Strömmas till <fil>.part i CWD och byts till rätt namn när den är verifierad
+            info = download_video(client, job_id, out_path)
         except Exception as e:
-            print(f"[VARN] Poll-fel: {e}")
-            time.sleep(poll_interval)
-            continue
-
-        status = getattr(status_obj, "status", "unknown")
-        progress = int(getattr(status_obj, "progress", 0) or 0)
-        status_msg = getattr(status_obj, "status_message", "")
-
-        if progress != last_progress or poll_count % 8 == 0:
-            filled = int(bar_len * (progress / 100.0))
-            bar = "█" * filled + "░" * (bar_len - filled)
-            elapsed = int(time.time() - start)
-            print(f"   [{bar}] {progress:3d}%  ({status})  t={elapsed}s")
-            last_progress = progress
-
-        if status == "completed":
-            print("\n[OK] Renderingen är klar. Hämtar video...")
-            try:
-                content = client.videos.download_content(job_id)
-
-                # Skriv direkt till fil i CWD
-                out_path.parent.mkdir(parents=True, exist_ok=True)
-                if hasattr(content, "write_to_file"):
-                    content.write_to_file(str(out_path))
-                else:
-                    with open(out_path, "wb") as f:
-                        if hasattr(content, "iter_bytes"):
-                            for chunk in content.iter_bytes():
-                                f.write(chunk)
-                        elif hasattr(content, "read"):
-                            f.write(content.read())
-                        else:
-                            raise RuntimeError("Okänt innehållsobjekt från SDK.")
-
-                print(f"[OK] Sparad: {out_path.resolve()}")
-                return out_path
-            except Exception as e:
-                print(f"[FEL] Nedladdning misslyckades: {e}")
-                return None
-
-        if status == "failed":
-            print(f"\n[FEL] Uppgiften misslyckades: {status_msg}")
-            try:
-                err = getattr(status_obj, "error", None)
-                if err:
-                    print(f"   Detaljer: {err}")
-            except Exception:
-                pass
+            journal.record(job_id, "download_failed", error=str(e))
+            print(f"[FEL] Nedladdning misslyckades: {e}")
             return None
-
-        poll_count += 1
-        time.sleep(poll_interval)
+        journal.record(job_id, "downloaded", bytes=info["bytes"], sha256=info["sha256"])
+        print(f"[OK] Sparad: {out_path.resolve()}")
+        print(f"   {format_download(info)}")
+        try:
+            cache.put(cache.key(**params), out_path, **params, job_id=job_id, sha256=info["sha256"])
+        except OSError as e:
+            print(f"[VARN] Kunde inte spara i cachen: {e}")
+        return out_path
+
+    msg = getattr(status_obj, "status_message", "") or polled.status
+    journal.record(job_id, polled.status, error=msg)
+    print(f"\n[FEL] Uppgiften misslyckades: {msg}")
+    try:
+        err = getattr(status_obj, "error", None)
+        if err:
+            print(f"   Detaljer: {err}")
+    except Exception:
+        pass
+    return None
 
 
 def main() -> int:
@@ -187,6 +198,7 @@ def main() -> int:
         seconds=seconds,
         size=size,
         model=model,
+        use_cache=cache_enabled(),
     )
 
     return 0 if result else 1
@@ -4,6 +4,16 @@
 Minimal text->video med OpenAI Sora 2.
 Användning (exempel):
     python ai_video.py --prompt "Filmisk solnedgång över fjäll" --seconds 8 --size 1280x720
+    python ai_video.py --batch prompts.txt --concurrency 8 -o ./klipp
+Batch: en prompt per rad (tomma rader och rader som börjar med # hoppas över).
+Jobben skapas, pollas och laddas ner parallellt, högst --concurrency åt gången,
+så total tid ligger nära det långsammaste jobbet i stället för summan av alla.
+Varje skickat jobb loggas i sora-jobs.jsonl (eller $SORA_JOURNAL). Efter timeout,
+krasch eller Ctrl-C hämtas kvarvarande jobb utan att något skickas på nytt med:
+    python ai_video.py --resume
+Färdiga videor cachas per (expanderad prompt, längd, upplösning, modell) i
+~/.cache/sora-renders (se sora_jobs.py); samma kombination igen kopieras direkt.
+--no-cache tvingar ny rendering.
 Krav:
     pip install --upgrade openai
 Miljö:
@@ -12,13 +22,21 @@ Miljö:
 
 import argparse
 import os
+import shutil
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 from openai import OpenAI
 
+from sora_jobs import (JobJournal, JobPoller, PolledJob, RenderCache, cache_enabled, download_video,
+                       format_download)
+
+_print_lock = threading.Lock()  # batch-trådar skriver hela rader åt gången
+
 
 def expand_prompt(user_prompt: str) -> str:
     """
@@ -34,37 +52,73 @@ def expand_prompt(user_prompt: str) -> str:
     return base
 
 
+def get_client() -> Optional[OpenAI]:
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        print("[FEL] Saknar OPENAI_API_KEY i miljön.")
+        return None
+    return OpenAI(api_key=api_key)
+
+
+def _say(tag: str, msg: str) -> None:
+    with _print_lock:
+        print(f"{tag}{msg}", flush=True)
+
+
 def generate_video(
     prompt: str,
     out_path: Path,
     seconds: int = 8,
     size: str = "1280x720",
     model: str = "sora-2",
-    poll_interval: int = 6,
     max_wait_seconds: int = 10 * 60,
+    client: Optional[OpenAI] = None,
+    tag: str = "",
+    poller: Optional[JobPoller] = None,
+    journal: Optional[JobJournal] = None,
+    cache: Optional[RenderCache] = None,
+    use_cache: bool = True,
 ) -> Optional[Path]:
     """
     Skapar en videouppgift, pollar tills klar, laddar ner MP4.
     Returnerar sökvägen till videon eller None vid fel.
+    I batch-läge delas `client` mellan trådarna och `tag` (t.ex. "[3/40] ")
+    sätts före varje utskrift; då skrivs bara en rad per statusändring/10 %.
+    Pollningen sköts av en JobPoller (adaptivt intervall, backoff vid fel);
+    skicka in en delad `poller` för att låta många jobb dela samma tråd.
+    Jobbet loggas i `journal` direkt efter att det skapats, så att det kan
+    återupptas med --resume efter timeout, krasch eller Ctrl-C.
+    Finns samma (prompt, seconds, size, model) i renderingscachen kopieras den
+    direkt utan API-anrop; use_cache=False tvingar ny rendering (som sedan cachas).
     """
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        print("[FEL] Saknar OPENAI_API_KEY i miljön.")
-        return None
+    cache = cache or RenderCache()
+    params = dict(prompt=prompt, seconds=seconds, size=size, model=model)
+    if use_cache:
+        hit = cache.get(cache.key(**params), out_path)
+        if hit is not None:
+            _say(tag, f"[CACHE] Träff ({hit['bytes'] / 1e6:.1f} MB), ingen rendering behövs: {prompt[:60]}")
+            _say(tag, f"[OK] Sparad: {out_path.resolve()}")
+            return out_path
 
-    client = OpenAI(api_key=api_key)
+    client = client or get_client()
+    if client is None:
+        return None
+    journal = journal or JobJournal()
 
     # Säkerställ mapp
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Starta jobb
-    print("\n" + "=" * 70)
-    print("[VIDEO] Skapar uppgift...")
-    print("=" * 70)
-    print(f"   Modell: {model}")
-    print(f"   Längd: {seconds}s")
-    print(f"   Upplösning: {size}")
-    print(f"   Prompt: {prompt[:120]}{'...' if len(prompt) > 120 else ''}")
+    if tag:
+        _say(tag, f"[VIDEO] Skapar uppgift: {prompt[:60]}{'...' if len(prompt) > 60 else ''}")
+    else:
+        print("\n" + "=" * 70)
+        print("[VIDEO] Skapar uppgift...")
+        print("=" * 70)
+        print(f"   Modell: {model}")
+        print(f"   Längd: {seconds}s")
+        print(f"   Upplösning: {size}")
+        print(f"   Prompt: {prompt[:120]}{'...' if len(prompt) > 120 else ''}")
 
     try:
         job = client.videos.create(
@@ -74,94 +128,296 @@ def generate_video(
             seconds=str(seconds)
         )
     except Exception as e:
-        print(f"[FEL] Kunde inte skapa video-uppgift: {e}")
+        _say(tag, f"[FEL] Kunde inte skapa video-uppgift: {e}")
         return None
 
     job_id = getattr(job, "id", None)
     if not job_id:
-        print("[FEL] Inget job-id i svaret.")
+        _say(tag, "[FEL] Inget job-id i svaret.")
         return None
 
-    print(f"   Jobb-ID: {job_id}")
+    journal.record(job_id, "submitted", **params, out_path=str(out_path.resolve()))
+    _say(tag, f"   Jobb-ID: {job_id}")
+    return finish_video(client, job_id, out_path, max_wait_seconds, tag, poller, journal, cache, params)
+
+
+def finish_video(
+    client: OpenAI,
+    job_id: str,
+    out_path: Path,
+    max_wait_seconds: int = 10 * 60,
+    tag: str = "",
+    poller: Optional[JobPoller] = None,
+    journal: Optional[JobJournal] = None,
+    cache: Optional[RenderCache] = None,
+    cache_params: Optional[dict] = None,
+    expected_sha256: Optional[str] = None,
+) -> Optional[Path]:
+    """
+    Väntar på ett redan skapat jobb och laddar ner det; används även av --resume.
+    Med cache_params (prompt, seconds, size, model) läggs videon i renderingscachen.
+    expected_sha256 (från journalen när ett redan nedladdat jobb hämtas igen) kontrolleras
+    innan filen byts på plats.
+    """
+    say = lambda msg: _say(tag, msg)  # noqa: E731
+    journal = journal or JobJournal()
 
-    # Poll-loop
+    # Pollning (delad poller i batch-läge, annars en egen för det här jobbet)
+    own_poller = poller is None
+    if own_poller:
+        poller = JobPoller(client)
     start = time.time()
-    last_progress = -1
-    poll_count = 0
+    shown = {"progress": -1, "status": None}
     bar_len = 28
 
-    while True:
-        # Timeout
-        if time.time() - start > max_wait_seconds:
-            print("\n[TIMEOUT] Uppgiften överskred tidsgränsen.")
-            print(f"   Du kan spara jobbid och försöka senare: {job_id}")
-            return None
+    def on_update(j: PolledJob) -> None:
+        if tag:
+            show = j.status != shown["status"] or j.progress // 10 != shown["progress"] // 10
+        else:
+            show = j.progress != shown["progress"] or j.status != shown["status"]
+        if show:
+            filled = int(bar_len * (j.progress / 100.0))
+            bar = "█" * filled + "░" * (bar_len - filled)
+            elapsed = int(time.time() - start)
+            say(f"   [{bar}] {j.progress:3d}%  ({j.status})  t={elapsed}s")
+            shown.update(progress=j.progress, status=j.status)
+
+    def on_error(j: PolledJob, e: BaseException) -> None:
+        say(f"[VARN] Poll-fel ({j.errors} st): {e}")
+
+    try:
+        polled = poller.wait(poller.track(job_id, on_update, max_wait_seconds, on_error))
+    finally:
+        if own_poller:
+            poller.close()
+    if polled.status == "interrupted":  # Ctrl-C: jobbet fortsätter på servern
+        journal.record(job_id, "interrupted")
+        return None
+
+    status_obj = polled.obj
+    m = polled.metrics()
+    lag = m["detect_lag_s"] if m["detect_lag_s"] is not None else m["detect_lag_max_s"]
+    lag_txt = f", upptäckt inom {lag:.1f}s" if lag is not None else ""
+    say(f"   Pollningar: {m['polls']} (fel: {m['errors']}){lag_txt}")
 
+    if polled.status == "timeout":
+        journal.record(job_id, "timeout")
+        say("[TIMEOUT] Uppgiften överskred tidsgränsen.")
+        say(f"   Jobbet ligger kvar i {journal.path}; återuppta med --resume ({job_id})")
+        return None
+
+    if polled.status == "completed":
+        journal.record(job_id, "completed")
+        say("[OK] Renderingen är klar. Hämtar video...")
         try:
-            status_obj = client.videos.retrieve(job_id)
+            info = download_video(client, job_id, out_path, expected_sha256=expected_sha256)
         except Exception as e:
-            print(f"[VARN] Poll-fel: {e}")
-            time.sleep(poll_interval)
-            continue
+            journal.record(job_id, "download_failed", error=str(e))
+            say(f"[FEL] Nedladdning misslyckades: {e} (försök igen med --resume)")
+            return None
+        journal.record(job_id, "downloaded", bytes=info["bytes"], sha256=info["sha256"])
+        say(f"[OK] Sparad: {out_path.resolve()}")
+        say(f"   {format_download(info)}")
+        if cache_params:
+            cache = cache or RenderCache()
+            try:
+                cache.put(cache.key(**cache_params), out_path, **cache_params, job_id=job_id, sha256=info["sha256"])
+            except OSError as e:
+                say(f"[VARN] Kunde inte spara i cachen: {e}")
+        return out_path
 
-        status = getattr(status_obj, "status", "unknown")
-        progress = int(getattr(status_obj, "progress", 0) or 0)
-        status_msg = getattr(status_obj, "status_message", "")
+    msg = getattr(status_obj, "status_message", "") or polled.status
+    journal.record(job_id, polled.status, error=msg)
+    if polled.status == "not_found":
+        say(f"[FEL] Jobbet finns inte längre på servern: {job_id}")
+        return None
+    say(f"[FEL] Uppgiften misslyckades: {msg}")
+    # För felsökning kan status_obj innehålla error-detaljer:
+    try:
+        err = getattr(status_obj, "error", None)
+        if err:
+            say(f"   Detaljer: {err}")
+    except Exception:
+        pass
+    return None
 
-        if progress != last_progress or poll_count % 8 == 0:
-            filled = int(bar_len * (progress / 100.0))
-            bar = "█" * filled + "░" * (bar_len - filled)
-            elapsed = int(time.time() - start)
-            print(f"   [{bar}] {progress:3d}%  ({status})  t={elapsed}s")
-            last_progress = progress
 
-        if status == "completed":
-            print("\n[OK] Renderingen är klar. Hämtar video...")
-            try:
-                content = client.videos.download_content(job_id)
-                # SDK-versioner kan skilja i nedladdnings-API—hantera flera fall:
-                if hasattr(content, "write_to_file"):
-                    content.write_to_file(str(out_path))
-                else:
-                    with open(out_path, "wb") as f:
-                        if hasattr(content, "iter_bytes"):
-                            for chunk in content.iter_bytes():
-                                f.write(chunk)
-                        elif hasattr(content, "read"):
-                            f.write(content.read())
-                        else:
-                            raise RuntimeError("Okänt innehållsobjekt från SDK.")
-                print(f"[OK] Sparad: {out_path.resolve()}")
-                return out_path
-            except Exception as e:
-                print(f"[FEL] Nedladdning misslyckades: {e}")
-                return None
-
-        if status == "failed":
-            print(f"\n[FEL] Uppgiften misslyckades: {status_msg}")
-            # För felsökning kan status_obj innehålla error-detaljer:
+def read_prompts(path: Path) -> list[str]:
+    """En prompt per rad; tomma rader och #-kommentarer hoppas över."""
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return [ln.strip() for ln in lines if ln.strip() and not ln.lstrip().startswith("#")]
+
+
+def _run_parallel(
+    client: OpenAI,
+    fn,
+    jobs: list[tuple[str, dict]],
+    concurrency: int,
+    title: str,
+) -> list[Optional[Path]]:
+    """
+    Kör fn(**kwargs) för varje (etikett, kwargs) i en trådpool med högst
+    `concurrency` samtidiga jobb. Alla delar klient, poller och journal.
+    """
+    n = len(jobs)
+    width = len(str(n))
+    workers = max(1, min(concurrency, n))
+
+    print("\n" + "=" * 70)
+    print(f"[BATCH] {title}, {workers} parallella jobb")
+    print("=" * 70)
+    start = time.time()
+    journal = JobJournal()
+    cache = RenderCache()
+    poller = JobPoller(client)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="video")
+    try:
+        futures = [
+            pool.submit(fn, client=client, poller=poller, journal=journal, cache=cache,
+                        tag=f"[{i:{width}d}/{n}] ", **kwargs)
+            for i, (_, kwargs) in enumerate(jobs, 1)
+        ]
+        results = []
+        for f in futures:
             try:
-                err = getattr(status_obj, "error", None)
-                if err:
-                    print(f"   Detaljer: {err}")
-            except Exception:
-                pass
-            return None
+                results.append(f.result())
+            except Exception as e:  # ska inte hända, men fäll inte hela batchen
+                print(f"[FEL] Oväntat fel i jobb: {e}")
+                results.append(None)
+    except KeyboardInterrupt:
+        # Släpp köade jobb och väck trådar som väntar i poller.wait(), annars hänger exit på dem
+        pool.shutdown(wait=False, cancel_futures=True)
+        poller.close()
+        _say("", f"\n[AVBRUTET] Skickade jobb ligger kvar i {journal.path}; återuppta med --resume")
+        raise
+    pool.shutdown()
+    poller.close()
+
+    ok = sum(r is not None for r in results)
+    print("\n" + "=" * 70)
+    print(f"[BATCH] Klart: {ok}/{n} lyckades på {time.time() - start:.0f}s")
+    for i, ((label, _), r) in enumerate(zip(jobs, results), 1):
+        if r is None:
+            print(f"   [FEL] {i:{width}d}: {label[:80]}")
+    s = poller.summary()
+    if s["jobs"]:
+        lag = "–" if s["detect_lag_mean_s"] is None else f"{s['detect_lag_mean_s']:.1f}s (max {s['detect_lag_max_s']:.1f}s)"
+        print(f"[BATCH] Pollningar: {s['polls']} ({s['polls_per_job']:.1f}/jobb), fel: {s['errors']}, "
+              f"upptäckt efter klar: {lag}")
+    return results
+
+
+def generate_batch(
+    prompts: list[str],
+    out_dir: Path,
+    concurrency: int = 4,
+    stem: str = "ai-video",
+    seconds: int = 8,
+    size: str = "1280x720",
+    model: str = "sora-2",
+    use_cache: bool = True,
+    **kwargs,
+) -> list[Optional[Path]]:
+    """
+    Kör generate_video för alla prompts i en trådpool med högst `concurrency`
+    samtidiga jobb (skapa, polla och ladda ner sker parallellt). Alla jobb
+    pollas av en gemensam JobPoller.
+    Cacheträffar hämtas först; API-klienten skapas bara om något saknas i cachen.
+    Returnerar en lista i samma ordning som prompts; None för misslyckade jobb.
+    """
+    width = len(str(len(prompts)))
+    outs = [out_dir / f"{stem}-{i:0{width}d}.mp4" for i in range(1, len(prompts) + 1)]
+    # Identiska prompts i samma batch renderas bara en gång och kopieras sedan
+    first: dict[str, int] = {}
+    for i, p in enumerate(prompts):
+        first.setdefault(expand_prompt(p), i)
+    unique = sorted(first.values())
+
+    done: dict[int, Optional[Path]] = {}
+    if use_cache:
+        cache = RenderCache()
+        for i in unique:
+            hit = cache.get(cache.key(expand_prompt(prompts[i]), seconds, size, model), outs[i])
+            if hit is not None:
+                print(f"[CACHE] Träff ({hit['bytes'] / 1e6:.1f} MB): {outs[i]}")
+                done[i] = outs[i]
+    missing = [i for i in unique if i not in done]
+
+    if missing:
+        # En klient för alla trådar (SDK:ns HTTP-klient är trådsäker och återanvänder anslutningar)
+        client = get_client()
+        if client is None:
+            done.update(dict.fromkeys(missing))
+        else:
+            params = dict(seconds=seconds, size=size, model=model, use_cache=False, **kwargs)
+            jobs = [(prompts[i], dict(prompt=expand_prompt(prompts[i]), out_path=outs[i], **params)) for i in missing]
+            title = f"{len(prompts)} prompts ({len(missing)} att rendera, {len(done)} från cachen) -> {out_dir}"
+            done.update(zip(missing, _run_parallel(client, generate_video, jobs, concurrency, title)))
 
-        poll_count += 1
-        time.sleep(poll_interval)
+    results: list[Optional[Path]] = []
+    for i, p in enumerate(prompts):
+        src = done[first[expand_prompt(p)]]
+        if i in done or src is None:
+            results.append(done.get(i))
+            continue
+        shutil.copyfile(src, outs[i])
+        print(f"[OK] Dubblett av {src.name}: {outs[i]}")
+        results.append(outs[i])
+    return results
+
+
+def resume_jobs(concurrency: int = 4, max_wait_seconds: int = 10 * 60) -> list[Optional[Path]]:
+    """
+    Återansluter till alla ej avslutade jobb i journalen (pågående, tidsgränsade,
+    klara men ej nedladdade) och laddar ner dem. Inga nya jobb skickas.
+    Nedladdade jobb vars utfil saknas eller har fel storlek hämtas igen och
+    kontrolleras mot den sha256 som journalen sparade vid första nedladdningen.
+    """
+    journal = JobJournal()
+    pending = journal.pending() + journal.damaged()
+    if not pending:
+        print(f"[OK] Inga jobb att återuppta i {journal.path}.")
+        return []
+    client = get_client()
+    if client is None:
+        return [None] * len(pending)
+    keys = ("prompt", "seconds", "size", "model")
+    jobs = [(f"{j['job_id']}: {j.get('prompt', '')}",
+             dict(job_id=j["job_id"], out_path=Path(j["out_path"]), max_wait_seconds=max_wait_seconds,
+                  cache_params={k: j[k] for k in keys} if all(k in j for k in keys) else None,
+                  expected_sha256=j.get("sha256")))
+            for j in pending]
+    return _run_parallel(client, finish_video, jobs, concurrency,
+                         f"Återupptar {len(pending)} jobb från {journal.path}")
 
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(
         description="Skriv en prompt och få en MP4-video från OpenAI Sora 2."
     )
-    p.add_argument(
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument(
         "--prompt", "-p",
         type=str,
-        required=True,
         help="Din videobeskrivning (text)."
     )
+    src.add_argument(
+        "--batch", "-b",
+        type=str,
+        metavar="FIL",
+        help="Textfil med en prompt per rad; alla körs parallellt."
+    )
+    src.add_argument(
+        "--resume",
+        action="store_true",
+        help="Återuppta ej nedladdade jobb från journalen (skickar inget nytt)."
+    )
+    p.add_argument(
+        "--concurrency", "-c",
+        type=int,
+        default=4,
+        help="Max antal samtidiga jobb i batch-/resume-läge (standard 4)."
+    )
     p.add_argument(
         "--seconds", "-s",
         type=int,
@@ -180,17 +436,58 @@ def parse_args() -> argparse.Namespace:
         default="sora-2",
         help='Modellnamn, t.ex. "sora-2" eller "sora-2-pro" om du har tillgång.'
     )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rendera på nytt även om samma prompt/parametrar finns i cachen."
+    )
     p.add_argument(
         "--output", "-o",
         type=str,
         default=None,
-        help="Utfil (MP4). Standard: ./output/<jobid>.mp4"
+        help="Utfil (MP4), eller utmapp i batch-läge. Standard: ./output/"
     )
     return p.parse_args()
 
 
 def main() -> int:
     args = parse_args()
+    try:
+        return _main(args)
+    except KeyboardInterrupt:
+        if not (args.batch or args.resume):  # batch/resume skriver redan tipset i _run_parallel
+            print(f"\n[AVBRUTET] Ett skickat jobb ligger kvar i {JobJournal().path}; återuppta med --resume")
+        return 130
+
+
+def _main(args: argparse.Namespace) -> int:
+    use_cache = cache_enabled() and not args.no_cache
+
+    if args.resume:
+        results = resume_jobs(concurrency=args.concurrency)
+        return 0 if all(r is not None for r in results) else 1
+
+    if args.batch:
+        batch_file = Path(args.batch)
+        try:
+            prompts = read_prompts(batch_file)
+        except OSError as e:
+            print(f"[FEL] Kunde inte läsa {batch_file}: {e}")
+            return 1
+        if not prompts:
+            print(f"[FEL] Inga prompts i {batch_file}.")
+            return 1
+        results = generate_batch(
+            prompts,
+            out_dir=Path(args.output) if args.output else Path("./output"),
+            concurrency=args.concurrency,
+            stem=batch_file.stem,
+            seconds=args.seconds,
+            size=args.size,
+            model=args.model,
+            use_cache=use_cache,
+        )
+        return 0 if all(r is not None for r in results) else 1
 
     # Liten prompt-boost om inmatningen är väldigt kort
     prompt = expand_prompt(args.prompt)
@@ -207,6 +504,7 @@ def main() -> int:
         seconds=args.seconds,
         size=args.size,
         model=args.model,
+        use_cache=use_cache,
     )
 
     if out_path is None:
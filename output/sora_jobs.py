@@ -0,0 +1,590 @@
+# -*- coding: utf-8 -*-
+"""
+Gemensam jobbhantering för Sora-skripten (ai_media_generator.py, ai_media_gen.py).
+
+JobPoller: en bakgrundstråd som pollar många video-jobb åt gången.
+- Intervallet anpassas efter rapporterad progress: poller sällan medan jobbet
+  är långt ifrån klart och tätare när det närmar sig 100 %.
+- Fel (nätverk, 429, 5xx) ger exponentiell backoff med jitter per jobb.
+- Varje jobb samlar mätvärden: antal pollningar, fel, total tid och hur
+  länge efter serverns färdigtid klienten upptäckte att jobbet var klart.
+
+JobJournal: append-only JSON lines-logg (standard ./sora-jobs.jsonl, eller
+$SORA_JOURNAL) med varje skickat jobb, dess prompt/parametrar, status och
+utfil. Avbrutna eller tidsgränsade jobb kan återupptas med --resume i
+ai_media_generator.py utan att något skickas på nytt; nedladdade filer som
+försvunnit hämtas då igen och kontrolleras mot journalens sha256.
+
+download_video: strömmande nedladdning i fasta bitar till en .part-fil med
+Range-återupptag, kontroll av storlek/ftyp/sha256 och atomiskt namnbyte.
+
+RenderCache: innehållsadresserad lokal cache av färdiga MP4:or, nycklad på
+sha256 av (expanderad prompt, seconds, size, model). Katalog $SORA_CACHE_DIR
+(standard ~/.cache/sora-renders), storleksgräns $SORA_CACHE_MAX_GB (standard 5)
+med LRU-rensning. $SORA_NO_CACHE=1 eller --no-cache tvingar ny rendering.
+
+Exempel:
+    poller = JobPoller(client)
+    job = poller.track(job_id, on_update=lambda j: print(j.progress))
+    poller.wait(job)            # blockerar tills klar/misslyckad/timeout/avbruten
+    print(job.metrics())
+    poller.close()
+"""
+
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+TERMINAL = ("completed", "failed", "cancelled", "expired", "timeout", "not_found")
+CHUNK_SIZE = 1 << 20  # 1 MiB per läs/skriv vid nedladdning
+DEFAULT_JOURNAL = Path(os.getenv("SORA_JOURNAL", "sora-jobs.jsonl"))
+# Journalstatusar som inte går att återuppta (allt annat räknas som pågående)
+JOURNAL_DONE = ("downloaded", "failed", "cancelled", "expired", "not_found")
+DEFAULT_CACHE_DIR = Path(os.getenv("SORA_CACHE_DIR", Path.home() / ".cache" / "sora-renders"))
+DEFAULT_CACHE_MAX_BYTES = int(float(os.getenv("SORA_CACHE_MAX_GB", "5")) * 1e9)
+
+
+@dataclass(eq=False)
+class PolledJob:
+    """Senast kända tillstånd för ett jobb plus mätvärden. Uppdateras av pollertråden."""
+    job_id: str
+    max_wait_seconds: float = 10 * 60
+    on_update: Optional[Callable[["PolledJob"], None]] = None
+    on_error: Optional[Callable[["PolledJob", BaseException], None]] = None
+    status: str = "queued"
+    progress: int = 0
+    obj: Any = None                     # senaste svaret från videos.retrieve
+    tracked_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None  # när pollern såg slutstatus
+    server_completed_at: Optional[float] = None
+    prev_poll_at: Optional[float] = None
+    last_poll_at: Optional[float] = None
+    polls: int = 0
+    errors: int = 0
+    last_error: Optional[BaseException] = None
+    interval: float = 0.0
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+    _first: Optional[tuple[float, int]] = field(default=None, repr=False)  # (tid, progress) vid renderingsstart
+    _errors_in_row: int = field(default=0, repr=False)
+
+    def metrics(self) -> dict:
+        """Mätvärden för jobbet; latenser i sekunder (None om okänt)."""
+        end = self.finished_at
+        lag = None
+        if end is not None and self.server_completed_at:
+            lag = max(0.0, end - self.server_completed_at)
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "polls": self.polls,
+            "errors": self.errors,
+            "elapsed_s": None if end is None else end - self.tracked_at,
+            # Faktisk fördröjning från serverns completed_at (om svaret har den)
+            "detect_lag_s": lag,
+            # Övre gräns för fördröjningen: tiden sedan föregående pollning
+            "detect_lag_max_s": None if end is None or self.prev_poll_at is None else end - self.prev_poll_at,
+        }
+
+
+class JobPoller:
+    """En tråd som multiplexar `client.videos.retrieve` för alla spårade jobb."""
+
+    def __init__(
+        self,
+        client,
+        min_interval: float = 1.0,
+        max_interval: float = 20.0,
+        max_backoff: float = 60.0,
+    ):
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_backoff = max_backoff
+        self._heap: list[tuple[float, int, PolledJob]] = []
+        self._seq = itertools.count()
+        self._cv = threading.Condition()
+        self._closed = False
+        self._jobs: list[PolledJob] = []
+        self._thread = threading.Thread(target=self._run, name="sora-poller", daemon=True)
+        self._thread.start()
+
+    # --- publikt ---
+    def track(
+        self,
+        job_id: str,
+        on_update: Optional[Callable[[PolledJob], None]] = None,
+        max_wait_seconds: float = 10 * 60,
+        on_error: Optional[Callable[[PolledJob, BaseException], None]] = None,
+    ) -> PolledJob:
+        """
+        Börja polla job_id. on_update anropas (i pollertråden) efter varje lyckad
+        pollning, on_error efter varje misslyckad.
+        """
+        job = PolledJob(job_id, max_wait_seconds=max_wait_seconds, on_update=on_update, on_error=on_error)
+        with self._cv:
+            self._jobs.append(job)
+            self._push(job, time.monotonic())
+        return job
+
+    def wait(self, job: PolledJob, timeout: Optional[float] = None) -> PolledJob:
+        job.done.wait(timeout)
+        return job
+
+    def metrics(self) -> list[dict]:
+        with self._cv:
+            return [j.metrics() for j in self._jobs]
+
+    def summary(self) -> dict:
+        """Sammanfattning över alla avslutade jobb."""
+        ms = [m for m in self.metrics() if m["elapsed_s"] is not None]
+        lags = [m["detect_lag_s"] if m["detect_lag_s"] is not None else m["detect_lag_max_s"]
+                for m in ms if m["status"] == "completed"]
+        lags = [x for x in lags if x is not None]
+        return {
+            "jobs": len(ms),
+            "polls": sum(m["polls"] for m in ms),
+            "errors": sum(m["errors"] for m in ms),
+            "polls_per_job": sum(m["polls"] for m in ms) / len(ms) if ms else 0.0,
+            "detect_lag_mean_s": sum(lags) / len(lags) if lags else None,
+            "detect_lag_max_s": max(lags) if lags else None,
+        }
+
+    def close(self) -> None:
+        """Stoppar pollertråden; jobb som inte hunnit bli klara avslutas som "interrupted",
+        så att ingen tråd blir hängande i wait()."""
+        with self._cv:
+            self._closed = True
+            self._cv.notify_all()
+        self._thread.join(timeout=5)
+        with self._cv:
+            for job in self._jobs:
+                if not job.done.is_set():
+                    self._finish(job, "interrupted")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- internt ---
+    def _push(self, job: PolledJob, due: float) -> None:
+        heapq.heappush(self._heap, (due, next(self._seq), job))
+        self._cv.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cv:
+                while not self._closed:
+                    now = time.monotonic()
+                    if self._heap and self._heap[0][0] <= now:
+                        break
+                    self._cv.wait(self._heap[0][0] - now if self._heap else None)
+                if self._closed:
+                    return
+                _, _, job = heapq.heappop(self._heap)
+            try:
+                delay = self._poll(job)
+            except Exception as e:  # t.ex. ogiltigt svar: avsluta jobbet, inte tråden som pollar alla
+                job.errors += 1
+                job.last_error = e
+                self._finish(job, "failed")
+                delay = None
+            if delay is not None:
+                with self._cv:
+                    self._push(job, time.monotonic() + delay)
+
+    def _finish(self, job: PolledJob, status: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        job.done.set()
+
+    def _poll(self, job: PolledJob) -> Optional[float]:
+        """Pollar ett jobb; returnerar fördröjning till nästa pollning, None om jobbet är avslutat."""
+        now = time.time()
+        if now - job.tracked_at > job.max_wait_seconds:
+            self._finish(job, "timeout")
+            return None
+        try:
+            obj = self.client.videos.retrieve(job.job_id)
+        except Exception as e:
+            job.errors += 1
+            job.last_error = e
+            job._errors_in_row += 1
+            self._notify(job.on_error, job, e)
+            if getattr(e, "status_code", None) == 404:  # jobbet finns inte (längre) på servern
+                self._finish(job, "not_found")
+                return None
+            return self._backoff(job, e)
+
+        job._errors_in_row = 0
+        job.prev_poll_at, job.last_poll_at = job.last_poll_at, time.time()
+        job.polls += 1
+        job.obj = obj
+        job.status = getattr(obj, "status", "unknown") or "unknown"
+        job.progress = int(getattr(obj, "progress", 0) or 0)
+        if job._first is None or job.status == "queued":
+            job._first = (job.last_poll_at, job.progress)  # takten räknas från när renderingen startar
+        if job.status == "completed":
+            ts = getattr(obj, "completed_at", None)
+            job.server_completed_at = float(ts) if isinstance(ts, (int, float)) else None
+
+        self._notify(job.on_update, job)
+        if job.status in TERMINAL:
+            job.finished_at = time.time()
+            job.done.set()
+            return None
+        job.interval = self._next_interval(job)
+        return job.interval
+
+    @staticmethod
+    def _notify(fn, *args) -> None:
+        if fn is not None:
+            try:
+                fn(*args)
+            except Exception:
+                pass  # en trasig callback ska inte stoppa pollern
+
+    def _next_interval(self, job: PolledJob) -> float:
+        """
+        Uppskatta återstående tid från progress-takten sedan första pollningen och
+        polla ungefär var tredjedel av den; utan progress växer intervallet ×1.5.
+        """
+        t0, p0 = job._first
+        dt = job.last_poll_at - t0
+        if job.progress > p0 and dt > 0:
+            rate = (job.progress - p0) / dt        # procent per sekund
+            eta = (100 - job.progress) / rate
+            interval = eta / 3
+        else:
+            interval = job.interval * 1.5 if job.interval else 2 * self.min_interval
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def _backoff(self, job: PolledJob, err: BaseException) -> float:
+        """Exponentiell backoff med jitter; respekterar Retry-After om servern skickar det."""
+        delay = min(self.max_backoff, self.min_interval * 2 ** job._errors_in_row)
+        delay *= random.uniform(0.5, 1.5)
+        headers = getattr(getattr(err, "response", None), "headers", None)
+        try:
+            retry_after = float(headers.get("retry-after")) if headers else None
+        except (TypeError, ValueError):
+            retry_after = None
+        if retry_after:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class JobJournal:
+    """
+    Append-only JSON lines: en rad per händelse, {"ts", "job_id", "status", ...}.
+    Senare rader för samma job_id skriver över fälten från tidigare.
+    """
+
+    def __init__(self, path: Path = DEFAULT_JOURNAL):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def record(self, job_id: str, status: str, **fields) -> None:
+        row = {"ts": time.strftime("%Y-%m-%dT%H:%M:%S"), "job_id": job_id, "status": status, **fields}
+        line = json.dumps(row, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())  # raden ska överleva en krasch direkt efter
+
+    def jobs(self) -> dict[str, dict]:
+        """Senaste sammanslagna tillstånd per job_id, i den ordning jobben skickades."""
+        out: dict[str, dict] = {}
+        if not self.path.exists():
+            return out
+        with self._lock, open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue  # halvskriven sista rad efter krasch
+                if isinstance(row, dict) and row.get("job_id"):
+                    out.setdefault(row["job_id"], {}).update(row)
+        return out
+
+    def pending(self) -> list[dict]:
+        """Jobb som ännu inte är nedladdade eller definitivt misslyckade."""
+        return [j for j in self.jobs().values() if j.get("status") not in JOURNAL_DONE]
+
+    def damaged(self) -> list[dict]:
+        """Nedladdade jobb vars utfil saknas eller inte har den journalförda storleken."""
+        out = []
+        for j in self.jobs().values():
+            if j.get("status") != "downloaded" or not j.get("out_path"):
+                continue
+            path = Path(j["out_path"])
+            if not path.exists() or path.stat().st_size != j.get("bytes"):
+                out.append(j)
+        return out
+
+
+class DownloadError(RuntimeError):
+    """Nedladdningen kunde inte slutföras eller verifieras."""
+
+
+def _stream_to_part(client, job_id: str, part: Path, offset: int, chunk_size: int,
+                    attempt: Optional[dict] = None) -> tuple[Optional[int], int]:
+    """
+    Strömmar videon till `part` i bitar om chunk_size byte, från `offset` om servern
+    svarar 206 på Range, annars från början. Returnerar (förväntad totalstorlek, skrivna byte).
+    `attempt["offset"]` sätts till den startposition som faktiskt används, så att anroparen
+    kan räkna skrivna byte även när strömmen avbryts halvvägs.
+    """
+    attempt = {} if attempt is None else attempt
+    streaming = getattr(client.videos, "with_streaming_response", None)
+    if streaming is None:
+        # Äldre SDK utan strömmande svar: ingen Range, skriv om hela filen
+        content = client.videos.download_content(job_id)
+        attempt["offset"] = 0  # strax innan .part skrivs om
+        if hasattr(content, "iter_bytes"):
+            with open(part, "wb") as f:
+                for chunk in content.iter_bytes(chunk_size):
+                    f.write(chunk)
+        elif hasattr(content, "write_to_file"):
+            content.write_to_file(str(part))
+        else:
+            raise DownloadError("Okänt innehållsobjekt från SDK.")
+        return None, part.stat().st_size
+
+    headers = {"Range": f"bytes={offset}-"} if offset else None
+    with streaming.download_content(job_id, extra_headers=headers) as resp:
+        h = resp.headers
+        m = re.match(r"bytes (\d+)-\d+/(\d+|\*)", h.get("content-range", ""))
+        if offset and resp.status_code == 206 and m and int(m.group(1)) == offset:
+            mode, total = "ab", (None if m.group(2) == "*" else int(m.group(2)))
+        else:
+            mode, total = "wb", None  # servern ignorerade Range: börja om
+            if h.get("content-length") and h.get("content-encoding", "identity") == "identity":
+                total = int(h["content-length"])
+        written = 0
+        attempt["offset"] = offset if mode == "ab" else 0
+        with open(part, mode) as f:
+            for chunk in resp.iter_bytes(chunk_size):
+                f.write(chunk)
+                written += len(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+    return total, written
+
+
+def _sha256(path: Path, chunk_size: int) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def download_video(
+    client,
+    job_id: str,
+    out_path: Path,
+    chunk_size: int = CHUNK_SIZE,
+    retries: int = 3,
+    expected_sha256: Optional[str] = None,
+) -> dict:
+    """
+    Laddar ner MP4 för ett klart jobb med konstant minnesanvändning:
+    - skriver i bitar till <out_path>.part och fortsätter med HTTP Range efter
+      avbrott (inom samma anrop vid nätverksfel, eller vid nästa körning/--resume),
+    - verifierar storlek mot Content-Length/Content-Range, att filen börjar med
+      en MP4 ftyp-box och, om angiven, sha256,
+    - byter atomiskt till out_path med os.replace först när allt stämmer.
+    Returnerar {"path", "bytes", "sha256", "seconds", "mb_per_s", "resumed_from", "range_offsets"}:
+    mb_per_s räknas på byte som faktiskt hämtades (tillväxten i .part per försök, även
+    avbrutna) över tiden i överföring (utan backoff-pauser); range_offsets är de
+    Range-startpositioner som servern godtog, resumed_from den första av dem (0 = ingen).
+    Kastar DownloadError (eller SDK-fel efter `retries` försök).
+    """
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    part = out_path.with_name(out_path.name + ".part")
+    start = time.time()
+    fetched = 0
+    transfer_s = 0.0
+    range_offsets: list[int] = []
+    failures = 0
+    while True:
+        offset = part.stat().st_size if part.exists() else 0
+        used: dict = {}
+        t0 = time.perf_counter()
+        try:
+            total, _ = _stream_to_part(client, job_id, part, offset, chunk_size, used)
+            error = None
+        except DownloadError:
+            raise
+        except Exception as e:
+            error = e
+        transfer_s += time.perf_counter() - t0
+        if used.get("offset"):
+            range_offsets.append(used["offset"])
+        if "offset" in used and part.exists():
+            fetched += part.stat().st_size - used["offset"]
+        if error is None:
+            break
+        if getattr(error, "status_code", None) == 416:  # Range utanför filen: .part är trasig
+            part.unlink(missing_ok=True)
+        failures += 1
+        if failures > retries:
+            raise error
+        time.sleep(min(30.0, 2.0 ** failures) * random.uniform(0.5, 1.5))
+
+    size = part.stat().st_size
+    if total is not None and size != total:
+        raise DownloadError(f"Fel storlek: {size} av {total} byte (.part sparas för återupptag)")
+    with open(part, "rb") as f:
+        head = f.read(12)
+    if len(head) < 12 or head[4:8] != b"ftyp":
+        part.unlink(missing_ok=True)
+        raise DownloadError("Filen är inte en giltig MP4 (saknar ftyp-box)")
+    digest = _sha256(part, chunk_size)
+    if expected_sha256 and digest != expected_sha256:
+        part.unlink(missing_ok=True)
+        raise DownloadError(f"sha256 stämmer inte: {digest} != {expected_sha256}")
+    os.replace(part, out_path)
+
+    return {
+        "path": str(out_path),
+        "bytes": size,
+        "sha256": digest,
+        "seconds": time.time() - start,
+        "mb_per_s": fetched / max(transfer_s, 1e-9) / 1e6,
+        "resumed_from": range_offsets[0] if range_offsets else 0,
+        "range_offsets": range_offsets,
+    }
+
+
+def format_download(info: dict) -> str:
+    """Kort rad om en nedladdning, t.ex. "12.3 MB på 2.1s (5.9 MB/s), sha256 3fa1c2d4…"."""
+    txt = f"{info['bytes'] / 1e6:.1f} MB på {info['seconds']:.1f}s ({info['mb_per_s']:.1f} MB/s)"
+    offsets = info["range_offsets"]
+    if offsets:
+        txt += f", återupptog {len(offsets)}× från {', '.join(f'{o / 1e6:.1f}' for o in offsets)} MB"
+    return f"{txt}, sha256 {info['sha256'][:8]}…"
+
+
+class RenderCache:
+    """
+    <root>/<nyckel>.mp4 plus <root>/index.json med storlek, sha256, parametrar och
+    senaste användning per nyckel. Index och filer skrivs atomiskt (tmp + os.replace).
+
+    Endast en process åt gången: låset delas av alla instanser i processen, men två
+    skript som samtidigt använder samma katalog kan skriva över varandras index
+    (filerna förblir hela; en förlorad indexpost betyder bara en cachemiss).
+    """
+
+    _lock = threading.Lock()  # delas av alla instanser i processen
+
+    def __init__(self, root: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(prompt: str, seconds: int, size: str, model: str) -> str:
+        blob = json.dumps({"prompt": prompt, "seconds": int(seconds), "size": size, "model": model},
+                          sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.mp4"
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            with open(self.root / "index.json", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, index: dict[str, dict]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f"index.json.{os.getpid()}.tmp"  # unikt per process; låset serialiserar trådarna
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.root / "index.json")
+
+    def get(self, key: str, dest: Path) -> Optional[dict]:
+        """
+        Kopierar cachad video till dest vid träff och returnerar indexposten, annars None.
+        Kopian kontrolleras mot indexets storlek och sha256; en trasig fil rensas bort (miss).
+        Kopieringen sker under låset så att en samtidig put inte kan rensa bort filen mitt i.
+        """
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + ".part")
+        with self._lock:
+            index = self._load()
+            entry = index.get(key)
+            if entry is None:
+                return None
+            src = self._path(key)
+            try:
+                if src.stat().st_size != entry.get("bytes") or _copy_sha256(src, tmp) != entry.get("sha256", "-"):
+                    raise FileNotFoundError(src)  # trasig fil: behandla som borttagen
+            except FileNotFoundError:
+                tmp.unlink(missing_ok=True)
+                src.unlink(missing_ok=True)
+                index.pop(key)  # fil borttagen (t.ex. av en annan process) eller trasig: glöm posten
+                self._save(index)
+                return None
+            os.replace(tmp, dest)
+            entry["last_used"] = time.time()
+            entry["hits"] = entry.get("hits", 0) + 1
+            self._save(index)
+        return entry
+
+    def put(self, key: str, src: Path, **meta) -> None:
+        """Lägger in en färdig video (kopia) och rensar äldst använda tills under max_bytes."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        digest = _copy_sha256(src, tmp)
+        with self._lock:
+            os.replace(tmp, self._path(key))
+            index = self._load()
+            now = time.time()
+            index[key] = {**meta, "sha256": digest, "bytes": self._path(key).stat().st_size,
+                          "created": now, "last_used": now}
+            self._evict(index, keep=key)
+            self._save(index)
+
+    def _evict(self, index: dict[str, dict], keep: str) -> None:
+        total = sum(e.get("bytes", 0) for e in index.values())
+        for k in sorted(index, key=lambda k: index[k].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            if k == keep:
+                continue
+            total -= index.pop(k).get("bytes", 0)
+            self._path(k).unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        index = self._load()
+        return {"entries": len(index), "bytes": sum(e.get("bytes", 0) for e in index.values()),
+                "max_bytes": self.max_bytes}
+
+
+def _copy_sha256(src: Path, dest: Path) -> str:
+    """Kopierar src till dest i CHUNK_SIZE-bitar och returnerar sha256 av innehållet."""
+    h = hashlib.sha256()
+    with open(src, "rb") as fi, open(dest, "wb") as fo:
+        for chunk in iter(lambda: fi.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+            fo.write(chunk)
+    return h.hexdigest()
+
+
+def cache_enabled() -> bool:
+    return os.getenv("SORA_NO_CACHE", "") not in ("1", "true", "yes")
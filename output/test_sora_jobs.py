@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""Tester för sora_jobs och ai_media_generator mot en falsk klient (ingen nätverkstrafik).  Kör: pytest output"""
+
+import contextlib
+import hashlib
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import sora_jobs  # noqa: E402
+from sora_jobs import DownloadError, JobJournal, RenderCache, download_video  # noqa: E402
+
+DATA = b"\0\0\0\x18ftypmp42" + bytes(range(256)) * 4000  # ~1 MB "MP4"
+
+
+class _Resp:
+    def __init__(self, data, offset, fail_at):
+        self.data, self.offset, self.fail_at = data, offset, fail_at
+        self.status_code = 206 if offset else 200
+        n = len(data)
+        self.headers = ({"content-range": f"bytes {offset}-{n - 1}/{n}"} if offset
+                        else {"content-length": str(n)})
+
+    def iter_bytes(self, chunk_size):
+        pos = self.offset
+        while pos < len(self.data):
+            if self.fail_at is not None and pos >= self.fail_at:
+                raise ConnectionError("connection reset")
+            yield self.data[pos:pos + chunk_size]
+            pos += chunk_size
+
+
+class FakeClient:
+    """videos.with_streaming_response.download_content med Range; `fails` = avbrottspositioner per anrop."""
+
+    def __init__(self, data=DATA, fails=(), honour_range=True):
+        self.data, self.fails, self.honour_range = data, list(fails), honour_range
+        self.ranges, self.retrieved = [], []
+        self.videos = self
+        self.with_streaming_response = self
+
+    @contextlib.contextmanager
+    def download_content(self, job_id, extra_headers=None):
+        offset = int(extra_headers["Range"][6:-1]) if extra_headers else 0
+        self.ranges.append(offset)
+        yield _Resp(self.data, offset if self.honour_range else 0, self.fails.pop(0) if self.fails else None)
+
+    def retrieve(self, job_id):
+        self.retrieved.append(job_id)
+        return type("S", (), {"status": "completed", "progress": 100, "completed_at": time.time()})()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(sora_jobs.time, "sleep", lambda s: None)
+
+
+def test_resumes_with_range_within_one_call(tmp_path):
+    client = FakeClient(fails=[100_000, 600_000])
+    out = tmp_path / "v.mp4"
+    info = download_video(client, "job", out, chunk_size=4096)
+    assert out.read_bytes() == DATA
+    assert not (tmp_path / "v.mp4.part").exists()
+    assert client.ranges[0] == 0 and client.ranges[1:] == info["range_offsets"]
+    assert info["resumed_from"] == info["range_offsets"][0] >= 100_000
+    assert info["sha256"] == hashlib.sha256(DATA).hexdigest()
+    assert info["mb_per_s"] > 0
+
+
+def test_leftover_part_is_resumed_by_next_call(tmp_path):
+    out = tmp_path / "v.mp4"
+    with pytest.raises(ConnectionError):
+        download_video(FakeClient(fails=[40 * 4096] * 3), "job", out, chunk_size=4096, retries=1)
+    part = tmp_path / "v.mp4.part"
+    assert not out.exists() and part.stat().st_size == 40 * 4096
+    info = download_video(FakeClient(), "job", out, chunk_size=4096)
+    assert out.read_bytes() == DATA
+    assert info["range_offsets"] == [40 * 4096]
+
+
+def test_server_ignoring_range_restarts(tmp_path):
+    out = tmp_path / "v.mp4"
+    (tmp_path / "v.mp4.part").write_bytes(b"garbage" * 1000)
+    info = download_video(FakeClient(honour_range=False), "job", out, chunk_size=4096)
+    assert out.read_bytes() == DATA
+    assert info["range_offsets"] == []
+
+
+def test_rejects_non_mp4_and_wrong_checksum(tmp_path):
+    out = tmp_path / "v.mp4"
+    with pytest.raises(DownloadError):
+        download_video(FakeClient(data=b"<html>error</html>" * 10), "job", out)
+    assert not out.exists() and not (tmp_path / "v.mp4.part").exists()
+    with pytest.raises(DownloadError):
+        download_video(FakeClient(), "job", out, expected_sha256="0" * 64)
+    assert not out.exists()
+
+
+class _NeverDone:
+    """videos.retrieve som aldrig blir klar."""
+
+    def __init__(self):
+        self.videos = self
+
+    def retrieve(self, job_id):
+        return type("S", (), {"status": "in_progress", "progress": 10})()
+
+
+def test_close_releases_waiting_threads():
+    poller = sora_jobs.JobPoller(_NeverDone(), min_interval=0.01)
+    job = poller.track("job")
+    waiter = threading.Thread(target=poller.wait, args=(job,))
+    waiter.start()
+    poller.close()
+    waiter.join(timeout=5)
+    assert not waiter.is_alive() and job.status == "interrupted"
+
+
+def test_journal_folds_rows_per_job_and_skips_a_truncated_line(tmp_path):
+    journal = JobJournal(tmp_path / "j.jsonl")
+    journal.record("a", "submitted", prompt="katt", out_path="a.mp4")
+    journal.record("b", "submitted", prompt="fjäll")
+    journal.record("a", "completed")
+    journal.record("b", "downloaded", bytes=10)
+    journal.record("c", "submitted", prompt="hav")
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"ts": "2026-01-01T00:00:00", "job_id": "c", "sta')  # krasch mitt i en rad
+    jobs = journal.jobs()
+    assert list(jobs) == ["a", "b", "c"]
+    assert (jobs["a"]["status"], jobs["a"]["prompt"], jobs["a"]["out_path"]) == ("completed", "katt", "a.mp4")
+    assert jobs["c"]["status"] == "submitted"
+    assert [j["job_id"] for j in journal.pending()] == ["a", "c"]
+
+
+def test_resume_downloads_pending_jobs_without_submitting(tmp_path, monkeypatch):
+    pytest.importorskip("openai")
+    import ai_media_generator as amg
+    journal = JobJournal(tmp_path / "j.jsonl")
+    params = dict(prompt="katt", seconds=8, size="1280x720", model="sora-2")
+    journal.record("a", "submitted", **params, out_path=str(tmp_path / "a.mp4"))
+    journal.record("b", "submitted", **params, out_path=str(tmp_path / "b.mp4"))
+    journal.record("b", "downloaded", bytes=len(DATA))
+    (tmp_path / "b.mp4").write_bytes(DATA)
+    journal.record("c", "interrupted", out_path=str(tmp_path / "c.mp4"))
+    client = FakeClient()  # saknar videos.create: ett nytt jobb skulle ge AttributeError
+    monkeypatch.setattr(amg, "get_client", lambda: client)
+    monkeypatch.setattr(amg, "JobJournal", lambda: journal)
+    monkeypatch.setattr(amg, "RenderCache", lambda: RenderCache(tmp_path / "cache"))
+    results = amg.resume_jobs(concurrency=2)
+    assert results == [tmp_path / "a.mp4", tmp_path / "c.mp4"]
+    assert sorted(client.retrieved) == ["a", "c"]
+    assert (tmp_path / "a.mp4").read_bytes() == (tmp_path / "c.mp4").read_bytes() == DATA
+    assert journal.pending() == [] and journal.jobs()["a"]["sha256"] == hashlib.sha256(DATA).hexdigest()
+    assert RenderCache(tmp_path / "cache").stats()["entries"] == 1  # bara a har promptparametrarna
+
+
+def _put(cache, tmp_path, name, data):
+    src = tmp_path / f"{name}.src.mp4"
+    src.write_bytes(data)
+    key = cache.key(name, 8, "1280x720", "sora-2")
+    cache.put(key, src)
+    return key
+
+
+def test_cache_hit_is_verified_and_a_corrupt_file_evicted(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+    key = _put(cache, tmp_path, "katt", DATA)
+    assert cache.get(key, tmp_path / "hit.mp4")["hits"] == 1
+    assert (tmp_path / "hit.mp4").read_bytes() == DATA
+    (tmp_path / "cache" / f"{key}.mp4").write_bytes(DATA[:-1] + b"x")  # samma storlek, fel innehåll
+    assert cache.get(key, tmp_path / "bad.mp4") is None
+    assert not (tmp_path / "bad.mp4").exists() and not (tmp_path / "bad.mp4.part").exists()
+    assert cache.stats()["entries"] == 0 and not (tmp_path / "cache" / f"{key}.mp4").exists()
+
+
+def test_cache_evicts_least_recently_used_under_the_byte_budget(tmp_path, monkeypatch):
+    clock = iter(range(1_000, 2_000))
+    monkeypatch.setattr(sora_jobs.time, "time", lambda: next(clock))
+    cache = RenderCache(tmp_path / "cache", max_bytes=2 * len(DATA) + 10)
+    a, b = _put(cache, tmp_path, "a", DATA), _put(cache, tmp_path, "b", DATA)
+    assert cache.get(a, tmp_path / "a.mp4") is not None  # a används senare än b
+    c = _put(cache, tmp_path, "c", DATA)
+    assert cache.get(b, tmp_path / "b.mp4") is None
+    assert cache.get(a, tmp_path / "a.mp4") is not None and cache.get(c, tmp_path / "c.mp4") is not None
+    assert cache.stats()["bytes"] == 2 * len(DATA)
+    big = _put(cache, tmp_path, "big", DATA * 3)  # större än hela budgeten: behålls ensam
+    assert list(sora_jobs.json.loads((tmp_path / "cache" / "index.json").read_text())) == [big]
+
+
+@pytest.mark.parametrize("argv, env, use_cache", [
+    ([], {}, True),
+    (["--no-cache"], {}, False),
+    ([], {"SORA_NO_CACHE": "1"}, False),
+])
+def test_no_cache_flag_and_env(tmp_path, monkeypatch, argv, env, use_cache):
+    pytest.importorskip("openai")
+    import ai_media_generator as amg
+    prompts = tmp_path / "p.txt"
+    prompts.write_text("katt\n", encoding="utf-8")
+    seen = {}
+    monkeypatch.setattr(amg, "generate_batch", lambda prompts, **kw: seen.update(kw) or [Path("x.mp4")])
+    monkeypatch.delenv("SORA_NO_CACHE", raising=False)
+    for k, v in env.items():
+        monkeypatch.setenv(k, v)
+    monkeypatch.setattr(sys, "argv", ["ai_media_generator.py", "--batch", str(prompts), *argv])
+    assert amg.main() == 0
+    assert seen["use_cache"] is use_cache
+
+
+def test_resume_refetches_a_lost_download_and_checks_the_journaled_sha256(tmp_path, monkeypatch):
+    pytest.importorskip("openai")
+    import ai_media_generator as amg
+    journal = JobJournal(tmp_path / "j.jsonl")
+    for job_id, sha in (("ok", hashlib.sha256(DATA).hexdigest()), ("changed", "0" * 64)):
+        journal.record(job_id, "submitted", out_path=str(tmp_path / f"{job_id}.mp4"))
+        journal.record(job_id, "downloaded", bytes=len(DATA), sha256=sha)  # filerna finns inte längre
+    assert [j["job_id"] for j in journal.damaged()] == ["ok", "changed"]
+    monkeypatch.setattr(amg, "get_client", lambda: FakeClient())
+    monkeypatch.setattr(amg, "JobJournal", lambda: journal)
+    monkeypatch.setattr(amg, "RenderCache", lambda: RenderCache(tmp_path / "cache"))
+    assert amg.resume_jobs() == [tmp_path / "ok.mp4", None]
+    assert (tmp_path / "ok.mp4").read_bytes() == DATA and not (tmp_path / "changed.mp4").exists()
+    assert journal.jobs()["changed"]["status"] == "download_failed"
+    assert [j["job_id"] for j in journal.damaged()] == []
+
+
+class _BadProgress:
+    """Jobbet "bad" svarar med icke-numerisk progress; "good" blir klart på andra pollningen."""
+
+    def __init__(self):
+        self.videos = self
+        self.polls = {}
+
+    def retrieve(self, job_id):
+        n = self.polls[job_id] = self.polls.get(job_id, 0) + 1
+        if job_id == "bad":
+            return type("S", (), {"status": "in_progress", "progress": "n/a"})()
+        return type("S", (), {"status": "completed" if n > 1 else "in_progress", "progress": 50 * n})()
+
+
+def test_a_failing_job_does_not_stop_the_poller():
+    with sora_jobs.JobPoller(_BadProgress(), min_interval=0.01) as poller:
+        bad = poller.track("bad", on_update=lambda j: 1 / 0)  # trasig callback ska inte heller störa
+        good = poller.track("good", on_update=lambda j: 1 / 0)
+        poller.wait(bad, timeout=5)
+        poller.wait(good, timeout=5)
+    assert bad.status == "failed" and isinstance(bad.last_error, ValueError)
+    assert good.status == "completed"